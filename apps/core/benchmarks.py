@@ -0,0 +1,222 @@
+"""
+Benchmarks for the project and user hot paths.
+
+``run_benchmarks`` seeds each scale with ``create_demo_data`` and measures
+latency percentiles, query counts and peak Python memory for every scenario.
+Results are plain dicts so they can be dumped to JSON and diffed between
+runs with ``compare_results``. Use the ``benchmark`` management command to
+run them against a throwaway database.
+"""
+import gc
+import itertools
+import platform
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from projects import cache as project_cache
+from projects.matching import MatchEngine
+from projects.models import Project
+from users.models import UserProfile
+from users.serializers import RegisterSerializer
+
+from .throttling import LocalMemoryStore, parse_rate, take
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class Context:
+    """Shared fixtures for one scale: a busy profile, a project and clients."""
+
+    def __init__(self):
+        self.profile = (
+            UserProfile.objects.select_related('user')
+            .order_by('-projects_joined__id').first()
+        )
+        self.project = Project.objects.order_by('pk').first()
+        self.anonymous = APIClient()
+        self.client = APIClient()
+        self.client.force_authenticate(self.profile.user)
+        self.counter = itertools.count()
+
+
+@scenario('project_list_api')
+def project_list_api(ctx):
+    return lambda: ctx.anonymous.get('/api/projects/api/')
+
+
+@scenario('my_projects_api')
+def my_projects_api(ctx):
+    return lambda: ctx.client.get('/api/projects/api/my/')
+
+
+@scenario('project_detail_view')
+def project_detail_view(ctx):
+    return lambda: ctx.anonymous.get(f'/{ctx.project.pk}/')
+
+
+@scenario('join_project_api')
+def join_project_api(ctx):
+    return lambda: ctx.client.post(f'/api/projects/api/{ctx.project.pk}/join/')
+
+
+@scenario('register_serializer')
+def register_serializer(ctx):
+    def run():
+        serializer = RegisterSerializer(data={
+            'username': f'bench_user_{next(ctx.counter)}_{time.time_ns()}',
+            'password': 'bench-password',
+            'skills': ['Python', 'Django'],
+        })
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    return run
+
+
+@scenario('match_scoring')
+def match_scoring(ctx):
+    return lambda: MatchEngine.from_queryset().top_k(ctx.profile, k=20)
+
+
+@scenario('team_formation_api')
+def team_formation_api(ctx):
+    return lambda: ctx.client.get(f'/api/projects/api/{ctx.project.pk}/team/')
+
+
+@scenario('match_top_k')
+def match_top_k(ctx):
+    engine = MatchEngine.from_queryset()
+    return lambda: engine.top_k(ctx.profile, k=20)
+
+
+@scenario('throttle_check')
+def throttle_check(ctx):
+    # the allowed path every throttled request pays
+    store = LocalMemoryStore()
+    rate = parse_rate('1000000/s')
+    return lambda: take(store, f'throttle:bench:user:{ctx.profile.pk}', rate, time.time())
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def failed(result):
+    """Whether a scenario call returned a non-2xx response (4xx, 5xx or a throttled 429)."""
+    status_code = getattr(result, 'status_code', None)
+    return status_code is not None and not 200 <= status_code < 300
+
+
+def measure(func, iterations, warmup=1, clear_cache=True):
+    for _ in range(warmup):
+        func()
+    timings = []
+    queries = []
+    errors = 0
+    for _ in range(iterations):
+        if clear_cache:
+            project_cache.get_cache().clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured.captured_queries))
+        errors += failed(result)
+
+    # tracing slows everything down, so memory gets its own run
+    if clear_cache:
+        project_cache.get_cache().clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': int(statistics.median(queries)),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'errors': errors,
+    }
+
+
+def run_benchmarks(scales, iterations=20, scenarios=None, clear_cache=True, seed=0, log=None):
+    """
+    ``scales`` is a list of ``(users, projects)`` pairs, run smallest first;
+    each scale tops up the data seeded by the previous one. Throttling is
+    turned off so repeated requests measure the views, not 429s.
+    """
+    names = scenarios or list(SCENARIOS)
+    results = {}
+    with override_settings(THROTTLE={**getattr(settings, 'THROTTLE', {}), 'ENABLED': False}):
+        for users, projects in sorted(scales):
+            call_command(
+                'create_demo_data', users=users, projects=projects, seed=seed, stdout=StringIO(),
+            )
+            ctx = Context()
+            label = f'{users}u_{projects}p'
+            results[label] = {}
+            for name in names:
+                if log:
+                    log(f'{label} {name}')
+                results[label][name] = measure(SCENARIOS[name](ctx), iterations, clear_cache=clear_cache)
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': iterations,
+            'cache_cleared': clear_cache,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, threshold=0.2, min_delta_ms=2.0):
+    """
+    Regressions of ``current`` against ``baseline``: a p50 latency more than
+    ``threshold`` (and ``min_delta_ms``) slower, any increase in queries, or
+    any failed request, since its timing measures an error path.
+    """
+    regressions = []
+    for label, scenarios in current['results'].items():
+        for name, stats in scenarios.items():
+            if stats.get('errors'):
+                regressions.append(f'{label} {name}: {stats["errors"]} non-2xx responses')
+            before = baseline.get('results', {}).get(label, {}).get(name)
+            if before is None:
+                continue
+            delta = stats['p50_ms'] - before['p50_ms']
+            if delta > min_delta_ms and stats['p50_ms'] > before['p50_ms'] * (1 + threshold):
+                regressions.append(
+                    f'{label} {name}: p50 {before["p50_ms"]}ms -> {stats["p50_ms"]}ms'
+                )
+            if stats['queries'] > before['queries']:
+                regressions.append(
+                    f'{label} {name}: queries {before["queries"]} -> {stats["queries"]}'
+                )
+    return regressions
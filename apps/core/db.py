@@ -0,0 +1,39 @@
+"""
+Database-specific schema extras.
+
+The JSON tag columns get GIN indexes on PostgreSQL so containment lookups
+(``tech_stack__contains=['Django']``) use an index. Other backends have no
+equivalent, so the indexes are created after ``migrate`` rather than declared
+on the models, which keeps the SQLite schema (and the test suite) unchanged.
+"""
+from django.apps import apps
+from django.db import connections
+
+# (model label, JSON field) pairs indexed with jsonb_path_ops
+JSON_GIN_INDEXES = [
+    ('projects.Project', 'tech_stack'),
+    ('projects.Project', 'needed_roles'),
+    ('users.UserProfile', 'skills'),
+    ('users.UserProfile', 'preferred_roles'),
+]
+
+
+def gin_index_sql(model, field_name, connection):
+    table = model._meta.db_table
+    column = model._meta.get_field(field_name).column
+    quote = connection.ops.quote_name
+    return (
+        f'CREATE INDEX IF NOT EXISTS {quote(f"{table}_{column}_gin")} '
+        f'ON {quote(table)} USING gin ({quote(column)} jsonb_path_ops)'
+    )
+
+
+def create_json_indexes(using='default'):
+    """Create any missing GIN indexes; returns how many statements ran (0 off PostgreSQL)."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return 0
+    with connection.cursor() as cursor:
+        for label, field_name in JSON_GIN_INDEXES:
+            cursor.execute(gin_index_sql(apps.get_model(label), field_name, connection))
+    return len(JSON_GIN_INDEXES)
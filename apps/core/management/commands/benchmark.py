@@ -0,0 +1,80 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks import SCENARIOS, compare_results, run_benchmarks
+
+
+def parse_scales(value):
+    scales = []
+    for part in value.split(','):
+        users, _, projects = part.partition(':')
+        scales.append((int(users), int(projects or users)))
+    return scales
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the project and user hot paths against a throwaway database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', default='100:50,1000:500,10000:5000',
+            help='Comma separated users:projects pairs (default: %(default)s)',
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Run only these scenarios')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep-cache', action='store_true', help='Do not clear the response cache between iterations')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--compare', help='Baseline JSON file; exit non-zero on regressions')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative p50 slowdown')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Ignore p50 slowdowns smaller than this')
+
+    def handle(self, *args, **options):
+        try:
+            scales = parse_scales(options['scales'])
+        except ValueError:
+            raise CommandError('--scales must look like 100:50,1000:500')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = run_benchmarks(
+                scales,
+                iterations=options['iterations'],
+                scenarios=options['scenario'],
+                clear_cache=not options['keep_cache'],
+                seed=options['seed'],
+                log=lambda msg: self.stderr.write(msg),
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for label, scenarios in results['results'].items():
+            for name, stats in scenarios.items():
+                if stats['errors']:
+                    self.stderr.write(self.style.WARNING(
+                        f'{label} {name}: {stats["errors"]} of {stats["iterations"]} requests failed'
+                    ))
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+            regressions = compare_results(
+                baseline, results, threshold=options['threshold'], min_delta_ms=options['min_delta_ms'],
+            )
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(self.style.ERROR(line))
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions'))
@@ -0,0 +1,119 @@
+"""
+In-process request metrics, aggregated per resolved URL name.
+
+Each route keeps histograms of wall time, query count and DB time plus the
+slowest queries seen on it. Numbers are per worker process; the metrics
+endpoint reports the worker that serves it.
+
+A query is logged when it takes at least ``settings.SLOW_QUERY_MS`` or when
+it displaces one of a route's slowest queries.
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def as_dict(self):
+        buckets = {f'le_{bound}': count for bound, count in zip(self.bounds, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': buckets,
+        }
+
+
+class RouteMetrics:
+    def __init__(self, slow_query_limit):
+        self.slow_query_limit = slow_query_limit
+        self.wall_ms = Histogram(TIME_BUCKETS_MS)
+        self.db_ms = Histogram(TIME_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        # min-heap of (duration_ms, sql) so the fastest of the slow queries pops first
+        self.slow_queries = []
+
+    def record(self, route, wall_ms, queries):
+        self.wall_ms.observe(wall_ms)
+        self.queries.observe(len(queries))
+        self.db_ms.observe(sum(duration for duration, _ in queries))
+        threshold = getattr(settings, 'SLOW_QUERY_MS', 100)
+        for duration, sql in queries:
+            entry = (round(duration, 3), sql)
+            displaces = len(self.slow_queries) >= self.slow_query_limit and entry > self.slow_queries[0]
+            if len(self.slow_queries) < self.slow_query_limit:
+                heapq.heappush(self.slow_queries, entry)
+            elif displaces:
+                heapq.heapreplace(self.slow_queries, entry)
+            if displaces or duration >= threshold:
+                logger.info('Slow query on %s (%.1fms): %s', route, duration, sql)
+
+    def as_dict(self):
+        return {
+            'wall_ms': self.wall_ms.as_dict(),
+            'db_ms': self.db_ms.as_dict(),
+            'queries': self.queries.as_dict(),
+            'slowest_queries': [
+                {'ms': duration, 'sql': sql}
+                for duration, sql in sorted(self.slow_queries, reverse=True)
+            ],
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, slow_query_limit=5):
+        self.slow_query_limit = slow_query_limit
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, wall_ms, queries):
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics(self.slow_query_limit)
+            metrics.record(route, wall_ms, queries)
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {route: metrics.as_dict() for route, metrics in sorted(self._routes.items())}
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,162 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default``. Reads go to one of
+``settings.DATABASE_REPLICAS`` only while ``ReplicaRoutingMiddleware`` is
+serving a GET/HEAD request to a view that opts in with ``replica_reads =
+True``. Everything else, including management commands and tests, reads from
+the primary.
+
+Read-your-writes: a successful write pins the client to the primary for
+``DATABASE_PRIMARY_PIN_SECONDS``, both by cookie and by user id (from the
+session or the JWT, so no query is needed to decide), so someone who just
+joined a project never reads a membership list the replica has not caught up
+with yet. Caches filled by replica-reading views must key on
+``read_source()``, or a lagging replica's rows would reach pinned clients
+through the cache.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.utils.functional import empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+PIN_COOKIE = 'db_primary'
+PIN_KEY = 'db:primary:{user_id}'
+SAFE_METHODS = ('GET', 'HEAD')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_jwt_authentication = JWTAuthentication()
+
+
+def read_source():
+    """``'replica'`` while the current request reads from a replica, else ``'primary'``."""
+    return 'replica' if _replica_reads.get() else 'primary'
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_pin_seconds():
+    return getattr(settings, 'DATABASE_PRIMARY_PIN_SECONDS', 10)
+
+
+def choose_replica():
+    replicas = get_replicas()
+    return random.choice(replicas) if replicas else None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return choose_replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas get their schema and rows from the primary
+        return db not in get_replicas()
+
+
+def is_replica_view(view_func):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    return getattr(view_func, 'replica_reads', False) or getattr(view_class, 'replica_reads', False)
+
+
+def request_user_id(request):
+    """The user id from the session or a valid JWT, without loading the user."""
+    # a user already loaded for this request (by DRF or a session view) is free to use
+    user = getattr(request.__dict__.get('user'), '_wrapped', request.__dict__.get('user'))
+    if user is not None and user is not empty and user.is_authenticated:
+        return user.pk
+    header = _jwt_authentication.get_header(request)
+    raw_token = _jwt_authentication.get_raw_token(header) if header is not None else None
+    if raw_token is not None:
+        try:
+            return _jwt_authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+        except (InvalidToken, TokenError):
+            return None
+    session = getattr(request, 'session', None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+def is_pinned(request):
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    user_id = request_user_id(request)
+    return user_id is not None and cache.get(PIN_KEY.format(user_id=user_id)) is not None
+
+
+def pin_to_primary(request, response):
+    seconds = get_pin_seconds()
+    response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+    user_id = request_user_id(request)
+    if user_id is not None:
+        cache.set(PIN_KEY.format(user_id=user_id), 1, seconds)
+
+
+class ReplicaRoutingMiddleware:
+    """Turns on replica reads for opted-in views; pins writers to the primary."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # keep the handler from running process_view in a thread
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        if self.should_pin(request, response):
+            pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _replica_reads.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        if self.should_pin(request, response):
+            await sync_to_async(pin_to_primary)(request, response)
+        return response
+
+    def should_pin(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400 and bool(get_replicas())
+
+    def wants_replica(self, request, view_func):
+        return request.method in SAFE_METHODS and bool(get_replicas()) and is_replica_view(view_func)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.wants_replica(request, view_func) and not is_pinned(request):
+            _replica_reads.set(True)
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        # is_pinned may load the session, so it runs off the event loop
+        if self.wants_replica(request, view_func) and not await sync_to_async(is_pinned)(request):
+            _replica_reads.set(True)
+        return None
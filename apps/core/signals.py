@@ -0,0 +1,11 @@
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .db import create_json_indexes
+
+
+@receiver(post_migrate)
+def create_database_indexes(sender, using='default', **kwargs):
+    if sender.name != 'core':
+        return
+    create_json_indexes(using)
@@ -1,3 +1,266 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import AsyncClient, TestCase, override_settings
+from projects.models import Project, ProjectQuerySet
+from users.models import UserProfile
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .benchmarks import compare_results, measure, run_benchmarks
+from . import routers
+from .db import create_json_indexes, gin_index_sql
+from .metrics import Histogram, RouteMetrics, registry
+from .throttling import CacheStore, LocalMemoryStore, Rate, parse_rate, take
+
+User = get_user_model()
+
+
+class BenchmarkTests(TestCase):
+    def test_run_benchmarks(self):
+        names = ['project_list_api', 'join_project_api', 'match_top_k', 'throttle_check']
+        results = run_benchmarks([(6, 4)], iterations=2, scenarios=names)
+        stats = results['results']['6u_4p']
+        self.assertEqual(set(stats), set(names))
+        for scenario in stats.values():
+            self.assertLessEqual(scenario['p50_ms'], scenario['max_ms'])
+            self.assertGreater(scenario['peak_memory_kb'], 0)
+            self.assertEqual(scenario['errors'], 0)
+        self.assertEqual(stats['match_top_k']['queries'], 0)
+        self.assertEqual(compare_results(results, results), [])
+
+    def test_compare_results_flags_regressions(self):
+        def run(p50, queries):
+            return {'results': {'10u_5p': {'project_list_api': {'p50_ms': p50, 'queries': queries}}}}
+
+        self.assertEqual(compare_results(run(10.0, 2), run(11.0, 2)), [])
+        self.assertEqual(len(compare_results(run(10.0, 2), run(20.0, 2))), 1)
+        self.assertEqual(len(compare_results(run(10.0, 2), run(10.0, 3))), 1)
+
+    def test_failed_requests_are_counted(self):
+        client = APIClient()
+        stats = measure(lambda: client.get('/api/projects/api/999999/'), iterations=3)
+        self.assertEqual(stats['errors'], 3)
+        results = {'results': {'1u_1p': {'missing': stats}}}
+        self.assertEqual(len(compare_results(results, results)), 1)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+
+    def test_records_per_route(self):
+        client = APIClient()
+        client.get('/api/projects/api/')
+        client.get('/api/projects/api/')
+        routes = registry.snapshot()
+        self.assertEqual(routes['projects:project_list_api']['wall_ms']['count'], 2)
+        self.assertGreater(routes['projects:project_list_api']['queries']['count'], 0)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        client = APIClient()
+        self.assertIn(client.get('/api/core/metrics/').status_code, (401, 403))
+        admin = User.objects.create_user('admin', password='pass12345', is_staff=True)
+        client.force_authenticate(admin)
+        client.get('/api/projects/api/')
+        response = client.get('/api/core/metrics/')
+        self.assertEqual(response.status_code, 200)
+        route = response.data['routes']['projects:project_list_api']
+        self.assertLessEqual(len(route['slowest_queries']), registry.slow_query_limit)
+        self.assertIn('hits', response.data['project_cache'])
+
+    @override_settings(SLOW_QUERY_MS=50)
+    def test_logs_only_slow_queries(self):
+        metrics = RouteMetrics(slow_query_limit=2)
+        with self.assertNoLogs('core.metrics', 'INFO'):
+            # the first queries fill the heap without being slow
+            metrics.record('route', 5, [(1.0, 'a'), (2.0, 'b'), (0.5, 'c')])
+        with self.assertLogs('core.metrics', 'INFO') as logs:
+            metrics.record('route', 5, [(3.0, 'd'), (60.0, 'e')])
+        self.assertEqual(len(logs.output), 2)
+        self.assertEqual([q['sql'] for q in metrics.as_dict()['slowest_queries']], ['e', 'd'])
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 5, 5, 50):
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertEqual(histogram.quantile(1.0), 100)
+        histogram.observe(1000)
+        self.assertEqual(histogram.as_dict()['buckets']['le_inf'], 1)
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_gin_indexes_only_on_postgres(self):
+        self.assertEqual(create_json_indexes(), 0)
+        self.assertEqual(
+            gin_index_sql(Project, 'tech_stack', connection),
+            'CREATE INDEX IF NOT EXISTS "projects_project_tech_stack_gin" '
+            'ON "projects_project" USING gin ("tech_stack" jsonb_path_ops)',
+        )
+
+
+# the test database mirrors every replica onto default, so "default" stands in for one here
+@override_settings(DATABASE_REPLICAS=['default'])
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        # pins are kept in the cache by user id, which the next test reuses
+        cache.clear()
+        user = User.objects.create_user(username='alice', password='pass12345')
+        self.profile = UserProfile.objects.create(user=user)
+        self.project = Project.objects.create(title='P', description='d', created_by=self.profile)
+        self.authorization = f'Bearer {AccessToken.for_user(user)}'
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+
+    def replica_reads(self, method, url):
+        with mock.patch.object(routers, 'choose_replica', wraps=routers.choose_replica) as choose:
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 400)
+        return choose.call_count
+
+    def test_opted_in_reads_use_replica(self):
+        self.assertGreater(self.replica_reads('get', '/api/projects/api/my/'), 0)
+        self.assertGreater(self.replica_reads('get', f'/api/projects/api/{self.project.pk}/'), 0)
+        self.assertEqual(self.replica_reads('get', '/api/projects/api/recommended/'), 0)
+        self.assertEqual(self.replica_reads('post', f'/api/projects/api/{self.project.pk}/join/'), 0)
+
+    def test_writer_pinned_to_primary(self):
+        response = self.client.post(f'/api/projects/api/{self.project.pk}/join/')
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        self.assertEqual(self.replica_reads('get', '/api/projects/api/my/'), 0)
+        # pinned by user id too, for clients that drop the cookie
+        self.client.cookies.clear()
+        self.assertEqual(self.replica_reads('get', '/api/projects/api/my/'), 0)
+
+    def test_writer_never_served_replica_cache(self):
+        writer = User.objects.create_user(username='bob', password='pass12345')
+        writer_profile = UserProfile.objects.create(user=writer)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(writer)}')
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(f'/api/projects/api/{self.project.pk}/join/')
+
+        for_listing = ProjectQuerySet.for_listing
+
+        def lagging_replica(queryset, fields=None):
+            queryset = for_listing(queryset, fields)
+            if routers.read_source() == 'replica':
+                # the replica has not replayed the join yet
+                queryset = queryset.prefetch_related(None).prefetch_related(
+                    Prefetch('members', queryset=UserProfile.objects.none())
+                )
+            return queryset
+
+        url = f'/api/projects/api/{self.project.pk}/'
+        with mock.patch.object(ProjectQuerySet, 'for_listing', lagging_replica):
+            self.assertEqual(APIClient().get(url).data['members'], [])
+            self.assertEqual(client.get(url).data['members'], [writer_profile.pk])
+
+    async def test_async_handler(self):
+        client = AsyncClient()
+        headers = {'authorization': self.authorization}
+        with mock.patch.object(routers, 'choose_replica', wraps=routers.choose_replica) as choose:
+            response = await client.get('/api/projects/api/my/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(choose.call_count, 0)
+        response = await client.post(f'/api/projects/api/{self.project.pk}/join/', headers=headers)
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        self.assertIsNone(routers.ReplicaRouter().db_for_read(Project))
+
+    def test_router(self):
+        router = routers.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Project))
+        self.assertEqual(router.db_for_write(Project), 'default')
+        with self.settings(DATABASE_REPLICAS=['replica_1']):
+            self.assertTrue(router.allow_migrate('default', 'projects'))
+            self.assertFalse(router.allow_migrate('replica_1', 'projects'))
+
+
+THROTTLE_TEST = {
+    'STORE': 'core.throttling.LocalMemoryStore',
+    'RATES': {
+        'login': {'user': '2/min', 'ip': '3/min'},
+        'register': {'ip': '1/min'},
+        'join': {'user': '2/min'},
+    },
+}
+
+
+@override_settings(THROTTLE=THROTTLE_TEST)
+class ThrottlingTests(TestCase):
+    def test_token_bucket(self):
+        rate = parse_rate('3/min')
+        self.assertEqual(rate, Rate(capacity=3, interval=20.0))
+        for store in (LocalMemoryStore(), CacheStore()):
+            self.assertEqual([take(store, 'k', rate, 1000.0) for _ in range(3)], [0, 0, 0])
+            self.assertAlmostEqual(take(store, 'k', rate, 1000.0), 20.0)
+            # one token back per interval, never more than the capacity
+            self.assertEqual(take(store, 'k', rate, 1020.0), 0)
+            self.assertGreater(take(store, 'k', rate, 1020.0), 0)
+            self.assertEqual(take(store, 'other', rate, 1000.0), 0)
+
+    def test_join_api_throttled_per_user(self):
+        user = User.objects.create_user(username='alice', password='pass12345')
+        profile = UserProfile.objects.create(user=user)
+        project = Project.objects.create(title='P', description='d', created_by=profile)
+        client = APIClient()
+        client.force_authenticate(user)
+        url = f'/api/projects/api/{project.pk}/join/'
+        self.assertEqual([client.post(url).status_code for _ in range(2)], [200, 200])
+        response = client.post(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        with self.settings(THROTTLE={**THROTTLE_TEST, 'ENABLED': False}):
+            self.assertEqual(client.post(url).status_code, 200)
+
+    def test_join_page_needs_post(self):
+        user = User.objects.create_user(username='alice', password='pass12345')
+        owner = UserProfile.objects.create(user=User.objects.create_user(username='bob', password='pass12345'))
+        profile = UserProfile.objects.create(user=user)
+        project = Project.objects.create(title='P', description='d', created_by=owner)
+        self.client.force_login(user)
+        url = f'/{project.pk}/join/'
+        self.assertEqual([self.client.post(url).status_code for _ in range(2)], [302, 302])
+        self.assertEqual(self.client.post(url).status_code, 429)
+        # GET neither toggles membership nor gets around the limit
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertFalse(project.has_member(profile))
+
+    def test_login_throttled_per_username_and_ip(self):
+        for _ in range(3):
+            self.client.get('/users/login/')
+        statuses = [
+            self.client.post('/users/login/', {'username': 'Bob', 'password': 'wrong'}).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [200, 200, 429])
+        # a different username has its own bucket, but the address has one try left
+        self.assertEqual(self.client.post('/users/login/', {'username': 'carol', 'password': 'x'}).status_code, 200)
+        self.assertEqual(self.client.post('/users/login/', {'username': 'dave', 'password': 'x'}).status_code, 429)
+
+    def test_rejected_request_drains_no_bucket(self):
+        def login(username, address='10.0.0.1'):
+            return self.client.post(
+                '/users/login/', {'username': username, 'password': 'x'}, REMOTE_ADDR=address,
+            ).status_code
+
+        self.assertEqual([login('a'), login('b'), login('c')], [200, 200, 200])
+        # rejected by the address limit, without spending one of a's two tries
+        self.assertEqual(login('a'), 429)
+        self.assertEqual([login('a', '10.0.0.2'), login('a', '10.0.0.3')], [200, 429])
+
+    def test_async_register_throttled(self):
+        data = {'username': 'erin', 'email': 'erin@example.com', 'password': 'pass12345'}
+        self.client.post('/users/api/register/', data, content_type='application/json')
+        response = self.client.post('/users/api/register/', data, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
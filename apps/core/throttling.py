@@ -0,0 +1,219 @@
+"""
+Token-bucket rate limiting.
+
+Every (scope, kind, client) triple has a bucket of ``N`` tokens refilled at
+``N`` per period. A bucket is stored GCRA-style as one number, the time at
+which it would be full again, so an allowed request costs one store read and
+one write per bucket and a rejected request costs only the reads. Nothing is locked: two
+requests racing for the last token may both get it, which is an acceptable
+error for abuse protection.
+
+Rates are configured per scope in ``settings.THROTTLE['RATES']``, one rate
+per kind of client key: ``user`` (the authenticated user, or whatever the
+view passes as ``user_key``) and ``ip``. Views opt in with
+``TokenBucketThrottle.scoped('join')`` or a ``throttle_scope`` attribute on
+DRF views, and with ``@throttle('login')`` on plain Django views, sync or
+async. The store is pluggable: ``LocalMemoryStore`` (per process) or
+``CacheStore`` (a Django cache such as Redis, shared by all workers).
+"""
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_store = None
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    interval: float  # seconds to refill one token
+
+
+def parse_rate(value):
+    """``'30/min'`` -> ``Rate(30, 2.0)``; the period is matched on its first letter."""
+    count, _, period = value.partition('/')
+    return Rate(capacity=int(count), interval=PERIODS[period.strip()[0]] / int(count))
+
+
+class LocalMemoryStore:
+    """Buckets in a dict: one process only; a single get or set is atomic under the GIL."""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._data = {}
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value, timeout):
+        if len(self._data) >= self.max_entries:
+            self.prune()
+        self._data[key] = value
+
+    def prune(self):
+        # a bucket that has refilled is the same as no bucket
+        now = time.time()
+        self._data = {key: value for key, value in list(self._data.items()) if value > now}
+
+
+class CacheStore:
+    """Buckets in a Django cache, shared between processes."""
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or get_config().get('CACHE_ALIAS', 'default')]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, math.ceil(timeout) + 1)
+
+
+def get_config():
+    return getattr(settings, 'THROTTLE', {})
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = import_string(get_config().get('STORE', 'core.throttling.LocalMemoryStore'))()
+    return _store
+
+
+@lru_cache(maxsize=None)
+def get_rates(scope):
+    rates = get_config().get('RATES', {}).get(scope) or {}
+    return {kind: parse_rate(rate) for kind, rate in rates.items() if rate}
+
+
+@receiver(setting_changed)
+def reset_throttling(setting, **kwargs):
+    global _store
+    if setting == 'THROTTLE':
+        _store = None
+        get_rates.cache_clear()
+
+
+def peek(store, key, rate, now):
+    """``(full_at, wait)``: the bucket's new value if a token is taken, and 0 or the seconds until one is free."""
+    full_at = max(store.get(key) or now, now) + rate.interval
+    allowed_from = full_at - rate.capacity * rate.interval
+    return full_at, max(allowed_from - now, 0)
+
+
+def take(store, key, rate, now):
+    """Take a token from the bucket at ``key``; returns 0, or the seconds until one is free."""
+    full_at, wait = peek(store, key, rate, now)
+    if not wait:
+        store.set(key, full_at, full_at - now)
+    return wait
+
+
+def check(scope, idents):
+    """
+    Take a token from each of ``scope``'s buckets for ``idents`` (``{kind:
+    client key}``) if every bucket has one; returns 0 if allowed, else the
+    seconds to wait. A rejected request takes nothing, so a client kept
+    out by one bucket does not drain the others.
+    """
+    rates = get_rates(scope)
+    if not rates or not get_config().get('ENABLED', True):
+        return 0
+    store = get_store()
+    now = time.time()
+    pending = []
+    wait = 0
+    for kind, rate in rates.items():
+        ident = idents.get(kind)
+        if ident is None:
+            continue
+        key = f'throttle:{scope}:{kind}:{ident}'
+        full_at, bucket_wait = peek(store, key, rate, now)
+        wait = max(wait, bucket_wait)
+        pending.append((key, full_at))
+    if wait:
+        return wait
+    for key, full_at in pending:
+        store.set(key, full_at, full_at - now)
+    return 0
+
+
+_ident = BaseThrottle()
+
+
+def client_ip(request):
+    """The client address, honouring ``NUM_PROXIES`` like DRF's throttles."""
+    return _ident.get_ident(request)
+
+
+def user_ident(user):
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """DRF throttle for the view's ``throttle_scope`` (or the scope bound by ``scoped``)."""
+    scope = None
+
+    @classmethod
+    def scoped(cls, scope):
+        return type(f'{scope.title()}TokenBucketThrottle', (cls,), {'scope': scope})
+
+    def allow_request(self, request, view):
+        scope = self.scope or getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        self.wait_seconds = check(scope, {'user': user_ident(request.user), 'ip': client_ip(request)})
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+def rejected(wait):
+    seconds = math.ceil(wait)
+    response = JsonResponse(
+        {'detail': f'Request was throttled. Expected available in {seconds} seconds.'}, status=429,
+    )
+    response['Retry-After'] = str(seconds)
+    return response
+
+
+def throttle(scope, methods=('POST',), user_key=None):
+    """
+    Rate-limit a plain Django view. ``user_key(request)`` replaces the
+    authenticated user as the ``user`` client key, e.g. the username a login
+    form is trying.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped(request, *args, **kwargs):
+                if request.method in methods:
+                    user = user_key(request) if user_key else user_ident(await request.auser())
+                    wait = check(scope, {'user': user, 'ip': client_ip(request)})
+                    if wait:
+                        return rejected(wait)
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            def _wrapped(request, *args, **kwargs):
+                if request.method in methods:
+                    user = user_key(request) if user_key else user_ident(request.user)
+                    wait = check(scope, {'user': user, 'ip': client_ip(request)})
+                    if wait:
+                        return rejected(wait)
+                return view_func(request, *args, **kwargs)
+        return _wrapped
+    return decorator
@@ -1,3 +1,15 @@
-from django.shortcuts import render
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
 
-# Create your views here.
+from projects import cache as project_cache
+from .metrics import registry
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics_view(request):
+    return Response({
+        'routes': registry.snapshot(),
+        'project_cache': project_cache.stats.as_dict(),
+    })
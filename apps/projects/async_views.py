@@ -0,0 +1,145 @@
+"""
+ASGI-native versions of the read-heavy project API endpoints.
+
+These mirror ``ProjectListAPIView``, ``ProjectDetailAPIView``,
+``MyProjectsAPIView`` and ``RecommendedProjectsAPIView`` response for
+response, but are plain ``async def`` views on the async ORM and cache API,
+so under an ASGI server a request waiting on a slow client or the database
+does not hold a worker thread.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import InvalidToken
+from users.auth import ProfileJWTAuthentication, cached_profile
+from users.models import UserProfile
+
+from . import cache as project_cache
+from .models import Project
+from .pagination import ProjectCursorPagination
+from .recommendations import get_recommendations
+from .serializers import ProjectSerializer, RecommendedProjectSerializer, requested_fields
+from .views import listing_queryset
+
+jwt_authentication = ProfileJWTAuthentication()
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+async def get_user(request):
+    """The JWT bearer user if an Authorization header is sent, else the session user."""
+    header = jwt_authentication.get_header(request)
+    raw_token = jwt_authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return await request.auser()
+    token = jwt_authentication.get_validated_token(raw_token)
+    return await sync_to_async(jwt_authentication.get_user)(token)
+
+
+async def get_profile(request):
+    """``(profile, error_response)``; ``profile`` is None for users without one."""
+    try:
+        user = await get_user(request)
+    except (InvalidToken, AuthenticationFailed) as exc:
+        return None, json_response(exc.detail, status=exc.status_code)
+    if not user.is_authenticated:
+        return None, json_response({'detail': 'Authentication credentials were not provided.'}, status=401)
+    loaded, profile = cached_profile(user)
+    if not loaded:
+        profile = await UserProfile.objects.filter(user=user).afirst()
+    return profile, None
+
+
+def serialize(serializer_class, instances, request, **context):
+    # every relation is prefetched, so serializing does not touch the database
+    return serializer_class(instances, many=True, context={'request': request, **context}).data
+
+
+async def build_list_page(request):
+    paginator = ProjectCursorPagination()
+    page = await paginator.apaginate_queryset(listing_queryset(request), Request(request))
+    return paginator.get_paginated_response(serialize(ProjectSerializer, page, request)).data
+
+
+async def cached_list_page(request):
+    key = await project_cache.alist_key('async', request.get_host() + '?' + request.GET.urlencode())
+    return await project_cache.aget_or_build(key, lambda: build_list_page(request))
+
+
+async def build_my_projects(profile, request):
+    if profile is None:
+        return []
+    projects = [p async for p in Project.objects.for_profile(profile).for_listing()]
+    return serialize(ProjectSerializer, projects, request)
+
+
+async def build_recommended(profile, request):
+    if profile is None:
+        return []
+    recommendations = await sync_to_async(get_recommendations)(profile)
+    ids = [pid for pid, _ in recommendations]
+    projects = await Project.objects.for_listing().ain_bulk(ids)
+    return serialize(
+        RecommendedProjectSerializer,
+        [projects[pid] for pid in ids if pid in projects],
+        request,
+        scores=dict(recommendations),
+    )
+
+
+@require_GET
+async def project_list_async(request):
+    return json_response(await cached_list_page(request))
+
+
+@require_GET
+async def project_detail_async(request, pk):
+    async def build():
+        fields = requested_fields(request)
+        project = await Project.objects.for_listing(fields=fields).filter(pk=pk).afirst()
+        if project is None:
+            return None
+        return ProjectSerializer(project, context={'request': request}).data
+
+    key = await project_cache.aobject_key('async', pk, request.GET.urlencode())
+    data = await project_cache.aget_or_build(key, build)
+    if data is None:
+        return json_response({'detail': 'No Project matches the given query.'}, status=404)
+    return json_response(data)
+
+
+@require_GET
+async def my_projects_async(request):
+    profile, error = await get_profile(request)
+    if error is not None:
+        return error
+    return json_response(await build_my_projects(profile, request))
+
+
+@require_GET
+async def recommended_projects_async(request):
+    profile, error = await get_profile(request)
+    if error is not None:
+        return error
+    return json_response(await build_recommended(profile, request))
+
+
+@require_GET
+async def project_overview_async(request):
+    """Latest page, joined projects and recommendations in one round trip."""
+    profile, error = await get_profile(request)
+    if error is not None:
+        return error
+    latest, mine, recommended = await asyncio.gather(
+        cached_list_page(request),
+        build_my_projects(profile, request),
+        build_recommended(profile, request),
+    )
+    return json_response({'latest': latest, 'mine': mine, 'recommended': recommended})
@@ -0,0 +1,169 @@
+"""
+Versioned response cache for project pages and API payloads.
+
+Cache keys embed a version number: one for the project list and one per
+project. Signal handlers bump the versions when a Project save/delete or
+membership change commits, so a cached entry can never be served after a
+write; old entries simply stop being addressed and age out of the backend.
+
+The cache alias is ``settings.PROJECT_CACHE_ALIAS`` (``default``), so the
+backend is whatever ``CACHES`` configures: local memory in development and
+tests, Redis in production.
+
+Templates cache rendered fragments (project cards, member lists) in the same
+backend with ``{% cache %}``, varying on a project's ``cache_version``.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+LIST_VERSION_KEY = 'projects:list:version'
+OBJECT_VERSION_KEY = 'projects:object:{pk}:version'
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else None,
+        }
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[getattr(settings, 'PROJECT_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'PROJECT_CACHE_TIMEOUT', 300)
+
+
+def _version(key):
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        # seed from the clock so an evicted counter never reverts to an old value
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def list_version():
+    return _version(LIST_VERSION_KEY)
+
+
+def object_version(pk):
+    return _version(OBJECT_VERSION_KEY.format(pk=pk))
+
+
+def object_versions(pks):
+    """``{pk: version}`` for many projects in one cache round trip."""
+    keys = {pk: OBJECT_VERSION_KEY.format(pk=pk) for pk in pks}
+    found = get_cache().get_many(list(keys.values()))
+    return {pk: found[key] if key in found else _version(key) for pk, key in keys.items()}
+
+
+def attach_versions(projects):
+    """Set ``cache_version`` on each project, for version-keyed template fragments."""
+    projects = list(projects)
+    versions = object_versions([project.pk for project in projects])
+    for project in projects:
+        project.cache_version = versions[project.pk]
+    return projects
+
+
+def invalidate_projects(project_ids):
+    """
+    Bump the list version and the version of every project in
+    ``project_ids`` once the current transaction commits (at once outside
+    one). Bumping earlier would let a concurrent reader cache the
+    pre-commit rows under the new version.
+    """
+    keys = [LIST_VERSION_KEY] + [OBJECT_VERSION_KEY.format(pk=pk) for pk in project_ids if pk is not None]
+    transaction.on_commit(lambda: _bump_many(keys))
+
+
+def _bump_many(keys):
+    for key in keys:
+        _bump(key)
+
+
+def list_key(name, variant=''):
+    return f'projects:list:{list_version()}:{name}:{variant}'
+
+
+def object_key(name, pk, variant=''):
+    return f'projects:object:{pk}:{object_version(pk)}:{name}:{variant}'
+
+
+def get_or_build(key, build):
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        stats.record(hit=True)
+        return value
+    stats.record(hit=False)
+    value = build()
+    cache.set(key, value, get_timeout())
+    return value
+
+
+async def _aversion(key):
+    cache = get_cache()
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+async def alist_key(name, variant=''):
+    return f'projects:list:{await _aversion(LIST_VERSION_KEY)}:{name}:{variant}'
+
+
+async def aobject_key(name, pk, variant=''):
+    return f'projects:object:{pk}:{await _aversion(OBJECT_VERSION_KEY.format(pk=pk))}:{name}:{variant}'
+
+
+async def aget_or_build(key, build):
+    """Async ``get_or_build``; ``build`` is a coroutine function."""
+    cache = get_cache()
+    value = await cache.aget(key)
+    if value is not None:
+        stats.record(hit=True)
+        return value
+    stats.record(hit=False)
+    value = await build()
+    await cache.aset(key, value, get_timeout())
+    return value
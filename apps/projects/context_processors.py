@@ -0,0 +1,9 @@
+from django.conf import settings
+
+
+def fragment_cache(request):
+    """Alias and timeout for ``{% cache %}`` blocks holding rendered project fragments."""
+    return {
+        'fragment_cache': getattr(settings, 'PROJECT_CACHE_ALIAS', 'default'),
+        'fragment_timeout': getattr(settings, 'PROJECT_FRAGMENT_TIMEOUT', 60 * 60),
+    }
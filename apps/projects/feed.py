@@ -0,0 +1,164 @@
+"""
+Swipe feed: the next unseen projects for a profile, best match first.
+
+Ranking the corpus happens once per queue: ``FeedQueue`` stores the top
+``QUEUE_SIZE`` unseen projects (padded with the newest ones when too few
+share a token with the profile). A page is a slice of that queue from the
+offset carried in an opaque, signed continuation token, minus anything the
+profile has swiped or joined since the queue was built. The queue is rebuilt
+only when it runs out, expires, or the profile's tags change.
+
+A profile's latest swipe on each project is kept in ``SwipeEvent``; a "like"
+also joins the project. Profiles cannot swipe on their own projects.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+
+from .index import candidates_for_profile, sharing_tags
+from .matching import MatchEngine
+from .models import FeedQueue, OwnProject, Project, SwipeEvent
+from .recommendations import excluded_project_ids
+
+DEFAULTS = {
+    'PAGE_SIZE': 10,
+    'MAX_PAGE_SIZE': 50,
+    'QUEUE_SIZE': 200,
+    'CANDIDATES': 1000,
+    'TTL': 30 * 60,
+}
+TOKEN_SALT = 'projects.feed'
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def get_setting(name):
+    return getattr(settings, 'PROJECT_FEED', {}).get(name, DEFAULTS[name])
+
+
+@dataclass
+class FeedPage:
+    projects: list = field(default_factory=list)
+    scores: dict = field(default_factory=dict)
+    token: str = None
+
+
+def unseen(queryset, profile):
+    """``queryset`` without the profile's own, joined and swiped projects."""
+    return queryset.exclude(created_by=profile).exclude(members=profile).exclude(swipes__profile=profile)
+
+
+def compute_queue(profile, size=None):
+    size = size or get_setting('QUEUE_SIZE')
+    seen = excluded_project_ids(profile)
+    seen.update(SwipeEvent.objects.filter(profile=profile).values_list('project_id', flat=True))
+    ranked = []
+    candidates = candidates_for_profile(profile, limit=get_setting('CANDIDATES'))
+    if candidates:
+        engine = MatchEngine.from_queryset(Project.objects.filter(pk__in=candidates))
+        ranked = engine.top_k(profile, k=size, exclude=seen)
+    if len(ranked) < size:
+        # projects sharing nothing with the profile still belong in the feed, newest first
+        rest = (
+            unseen(Project.objects.all(), profile).exclude(pk__in=[pid for pid, _ in ranked])
+            .order_by('-created_at', '-pk').values_list('pk', flat=True)[:size - len(ranked)]
+        )
+        ranked += [(pid, 0.0) for pid in rest]
+    return ranked
+
+
+def refresh_queue(profile, previous=None):
+    items = [[pid, round(score, 6)] for pid, score in compute_queue(profile)]
+    generation = previous.generation + 1 if previous is not None else 1
+    entry, _ = FeedQueue.objects.update_or_create(
+        profile=profile,
+        defaults={'items': items, 'generation': generation, 'computed_at': timezone.now(), 'is_stale': False},
+    )
+    return entry
+
+
+def get_queue(profile):
+    entry = FeedQueue.objects.filter(profile=profile).first()
+    cutoff = timezone.now() - timedelta(seconds=get_setting('TTL'))
+    if entry is None or entry.is_stale or entry.computed_at < cutoff:
+        entry = refresh_queue(profile, entry)
+    return entry
+
+
+def invalidate_profiles(profile_ids):
+    profile_ids = [pid for pid in profile_ids if pid is not None]
+    if profile_ids:
+        FeedQueue.objects.filter(profile_id__in=profile_ids).update(is_stale=True)
+
+
+def projects_changed(skill_ids, role_ids):
+    """Mark stale the queues of profiles sharing a tag with changed projects."""
+    FeedQueue.objects.filter(sharing_tags(skill_ids, role_ids), is_stale=False).update(is_stale=True)
+
+
+def make_token(profile, entry, offset):
+    return signing.dumps([profile.pk, entry.generation, offset], salt=TOKEN_SALT)
+
+
+def read_token(profile, token):
+    """``(generation, offset)`` from a token issued to ``profile``."""
+    try:
+        profile_id, generation, offset = signing.loads(token, salt=TOKEN_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidToken('Invalid continuation token.')
+    if profile_id != profile.pk or not isinstance(offset, int) or offset < 0:
+        raise InvalidToken('Invalid continuation token.')
+    return generation, offset
+
+
+def next_page(profile, token=None, limit=None):
+    """The next ``limit`` unseen projects after ``token`` (the start of the feed if None)."""
+    limit = min(max(limit or get_setting('PAGE_SIZE'), 1), get_setting('MAX_PAGE_SIZE'))
+    entry = get_queue(profile)
+    offset = 0
+    if token is not None:
+        generation, offset = read_token(profile, token)
+        if generation != entry.generation:
+            # the queue was rebuilt without what was seen since; start it from the top
+            offset = 0
+        elif offset >= len(entry.items):
+            entry = refresh_queue(profile, entry)
+            offset = 0
+
+    page = FeedPage()
+    while len(page.projects) < limit and offset < len(entry.items):
+        # read a little past the page in case some queued projects were seen meanwhile
+        window = entry.items[offset:offset + limit * 2]
+        available = unseen(Project.objects.for_listing(), profile).in_bulk([pid for pid, _ in window])
+        for pid, score in window:
+            offset += 1
+            if pid in available:
+                page.projects.append(available[pid])
+                page.scores[pid] = score
+                if len(page.projects) == limit:
+                    break
+    if page.projects:
+        page.token = make_token(profile, entry, offset)
+    return page
+
+
+def record_swipe(profile, project, direction):
+    """
+    Record the swipe, replacing any earlier one on the project; a like also
+    joins it. Returns whether the profile joined.
+    """
+    if project.created_by_id == profile.pk:
+        raise OwnProject('You cannot swipe on your own project.')
+    with transaction.atomic():
+        # one INSERT ... ON CONFLICT DO UPDATE, no read first
+        SwipeEvent.objects.bulk_create(
+            [SwipeEvent(profile=profile, project=project, direction=direction)],
+            update_conflicts=True, unique_fields=['profile', 'project'], update_fields=['direction'],
+        )
+        return direction == SwipeEvent.LIKE and project.add_member(profile)
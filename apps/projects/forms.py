@@ -1,5 +1,6 @@
 from django import forms
 from .models import Project
+from users.canonical import canonicalize_list
 
 
 class ProjectForm(forms.ModelForm):
@@ -23,13 +24,13 @@ class ProjectForm(forms.ModelForm):
         raw = self.cleaned_data.get('tech_stack_raw', '')
         if not raw:
             return []
-        return [item.strip() for item in raw.split(',') if item.strip()]
+        return canonicalize_list(raw.split(','))
 
     def clean_needed_roles_raw(self):
         raw = self.cleaned_data.get('needed_roles_raw', '')
         if not raw:
             return []
-        return [item.strip() for item in raw.split(',') if item.strip()]
+        return canonicalize_list(raw.split(','))
 
     def save(self, commit=True, created_by=None):
         # create instance without saving many-to-many
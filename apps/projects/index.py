@@ -0,0 +1,156 @@
+"""
+Inverted index from skill/role tokens to projects.
+
+Project tags are mirrored into the indexed ProjectSkill/ProjectRole tables
+(see ``users.tags``), which lets recommendation and search features fetch a
+short list of candidate projects with an indexed lookup instead of decoding
+every Project's JSON fields in Python. Tokens are the ``skill:<name>`` /
+``role:<name>`` strings used by ``projects.matching``.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+
+from users.models import ProfileRole, ProfileSkill
+from users.tags import get_or_create_roles, get_or_create_skills, normalize_tag
+from .matching import profile_features
+from .models import Project, ProjectRole, ProjectSkill
+
+DEFAULT_CANDIDATE_LIMIT = 500
+
+
+def _wanted_rows(project, skills, roles):
+    skill_ids = {skills[normalize_tag(name)].pk for name in project['tech_stack'] or [] if normalize_tag(name)}
+    role_ids = {roles[normalize_tag(name)].pk for name in project['needed_roles'] or [] if normalize_tag(name)}
+    return skill_ids, role_ids
+
+
+def _as_row(project):
+    if isinstance(project, dict):
+        return project
+    return {'id': project.pk, 'tech_stack': project.tech_stack, 'needed_roles': project.needed_roles}
+
+
+@transaction.atomic
+def index_project(project):
+    """
+    Bring the index rows for ``project`` in line with its current fields.
+    If any row changed, returns ``(skill_ids, role_ids)``: every tag the
+    project had before or has now. Otherwise returns None.
+    """
+    row = _as_row(project)
+    skills = get_or_create_skills(row['tech_stack'] or [])
+    roles = get_or_create_roles(row['needed_roles'] or [])
+    wanted_skills, wanted_roles = _wanted_rows(row, skills, roles)
+
+    existing_skills = set(ProjectSkill.objects.filter(project_id=row['id']).values_list('skill_id', flat=True))
+    existing_roles = set(ProjectRole.objects.filter(project_id=row['id']).values_list('role_id', flat=True))
+    changed = False
+    if existing_skills != wanted_skills:
+        ProjectSkill.objects.filter(project_id=row['id'], skill_id__in=existing_skills - wanted_skills).delete()
+        ProjectSkill.objects.bulk_create([
+            ProjectSkill(project_id=row['id'], skill_id=skill_id) for skill_id in wanted_skills - existing_skills
+        ], ignore_conflicts=True)
+        changed = True
+    if existing_roles != wanted_roles:
+        ProjectRole.objects.filter(project_id=row['id'], role_id__in=existing_roles - wanted_roles).delete()
+        ProjectRole.objects.bulk_create([
+            ProjectRole(project_id=row['id'], role_id=role_id) for role_id in wanted_roles - existing_roles
+        ], ignore_conflicts=True)
+        changed = True
+    if not changed:
+        return None
+    return existing_skills | wanted_skills, existing_roles | wanted_roles
+
+
+def project_tag_ids(project_ids):
+    """``(skill_ids, role_ids)`` currently indexed for ``project_ids``."""
+    return (
+        set(ProjectSkill.objects.filter(project_id__in=project_ids).values_list('skill_id', flat=True)),
+        set(ProjectRole.objects.filter(project_id__in=project_ids).values_list('role_id', flat=True)),
+    )
+
+
+def sharing_tags(skill_ids, role_ids):
+    """
+    Filter on ``profile_id`` for profiles with any of the given skills (or
+    interests) or roles, evaluated in the database through the tag index.
+    """
+    return (
+        Q(profile_id__in=ProfileSkill.objects.filter(skill_id__in=skill_ids).values('profile_id'))
+        | Q(profile_id__in=ProfileRole.objects.filter(role_id__in=role_ids).values('profile_id'))
+    )
+
+
+def rebuild_index(queryset=None, batch_size=1000):
+    """Rebuild index rows for ``queryset`` (all projects by default) in batches."""
+    if queryset is None:
+        queryset = Project.objects.all()
+    rows = queryset.values('id', 'tech_stack', 'needed_roles').order_by('pk')
+    total = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            total += _reindex_batch(batch)
+            batch = []
+    if batch:
+        total += _reindex_batch(batch)
+    return total
+
+
+@transaction.atomic
+def _reindex_batch(rows):
+    skills = get_or_create_skills([name for row in rows for name in row['tech_stack'] or []])
+    roles = get_or_create_roles([name for row in rows for name in row['needed_roles'] or []])
+    skill_rows = []
+    role_rows = []
+    for row in rows:
+        skill_ids, role_ids = _wanted_rows(row, skills, roles)
+        skill_rows += [ProjectSkill(project_id=row['id'], skill_id=skill_id) for skill_id in skill_ids]
+        role_rows += [ProjectRole(project_id=row['id'], role_id=role_id) for role_id in role_ids]
+    project_ids = [row['id'] for row in rows]
+    ProjectSkill.objects.filter(project_id__in=project_ids).delete()
+    ProjectRole.objects.filter(project_id__in=project_ids).delete()
+    ProjectSkill.objects.bulk_create(skill_rows)
+    ProjectRole.objects.bulk_create(role_rows)
+    return len(rows)
+
+
+def candidate_project_ids(tokens, limit=DEFAULT_CANDIDATE_LIMIT):
+    """
+    Ids of projects sharing at least one of ``tokens``, most shared tokens
+    first. Only index rows for the requested tokens are read.
+    """
+    skills = set()
+    roles = set()
+    for token in tokens:
+        kind, _, name = token.partition(':')
+        if kind == 'skill':
+            skills.add(name)
+        elif kind == 'role':
+            roles.add(name)
+
+    hits = []
+    matches = Q()
+    if skills:
+        matches |= Q(pk__in=ProjectSkill.objects.filter(skill__normalized__in=skills).values('project_id'))
+        hits.append(Count('project_skills', filter=Q(project_skills__skill__normalized__in=skills), distinct=True))
+    if roles:
+        matches |= Q(pk__in=ProjectRole.objects.filter(role__normalized__in=roles).values('project_id'))
+        hits.append(Count('project_roles', filter=Q(project_roles__role__normalized__in=roles), distinct=True))
+    if not hits:
+        return []
+    rows = (
+        Project.objects.filter(matches)
+        .values('pk')
+        .annotate(hits=sum(hits[1:], hits[0]))
+        .order_by('-hits', '-pk')
+        .values_list('pk', flat=True)
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return list(rows)
+
+
+def candidates_for_profile(profile, limit=DEFAULT_CANDIDATE_LIMIT):
+    return candidate_project_ids(profile_features(profile), limit=limit)
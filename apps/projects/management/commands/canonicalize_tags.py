@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects import recommendations, similarity
+from projects.feed import invalidate_profiles as invalidate_feeds
+from projects.index import rebuild_index
+from projects.models import Project
+from projects.search import get_backend as get_search_backend
+from projects.signals import projects_saved_in_bulk
+from users.canonical import canonicalize_list, canonicalizer
+from users.models import Role, Skill, UserProfile
+from users.tags import rebuild_profile_tags
+
+PROFILE_FIELDS = ('skills', 'interests', 'preferred_roles')
+PROJECT_FIELDS = ('tech_stack', 'needed_roles')
+
+
+class Command(BaseCommand):
+    help = 'Rewrite stored skill/tech/role tags to their canonical form and rebuild the tag tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        canonicalizer.invalidate()
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+
+        profiles = self.rewrite(UserProfile.objects.all(), PROFILE_FIELDS, self.reindex_profiles)
+        projects = self.rewrite(Project.objects.all(), PROJECT_FIELDS, self.reindex_projects)
+        if not self.dry_run:
+            Skill.objects.filter(profile_skills__isnull=True, project_skills__isnull=True).delete()
+            Role.objects.filter(profile_roles__isnull=True, project_roles__isnull=True).delete()
+
+        prefix = 'Would rewrite' if self.dry_run else 'Rewrote'
+        self.stdout.write(self.style.SUCCESS(f'{prefix} {profiles} profiles and {projects} projects'))
+
+    def rewrite(self, queryset, fields, reindex):
+        rows = queryset.only('pk', *fields).order_by('pk')
+        changed_total = 0
+        batch = []
+        for obj in rows.iterator(chunk_size=self.batch_size):
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                changed_total += self.rewrite_batch(queryset.model, batch, fields, reindex)
+                batch = []
+        if batch:
+            changed_total += self.rewrite_batch(queryset.model, batch, fields, reindex)
+        return changed_total
+
+    def rewrite_batch(self, model, objs, fields, reindex):
+        changed = []
+        for obj in objs:
+            dirty = False
+            for field in fields:
+                value = getattr(obj, field) or []
+                canonical = canonicalize_list(value)
+                if canonical != value:
+                    setattr(obj, field, canonical)
+                    dirty = True
+            if dirty:
+                changed.append(obj)
+        if self.dry_run:
+            return len(changed)
+        with transaction.atomic():
+            if changed:
+                model.objects.bulk_update(changed, fields)
+            # bulk_update skips signals; the tag tables are rebuilt for the whole batch
+            # since their normalized keys may predate canonicalization
+            reindex([obj.pk for obj in objs], [obj.pk for obj in changed])
+        return len(changed)
+
+    def reindex_profiles(self, pks, changed):
+        rebuild_profile_tags(UserProfile.objects.filter(pk__in=pks), batch_size=self.batch_size)
+        recommendations.invalidate_profiles(changed)
+        invalidate_feeds(changed)
+
+    def reindex_projects(self, pks, changed):
+        unchanged = Project.objects.filter(pk__in=pks).exclude(pk__in=changed)
+        rebuild_index(unchanged, batch_size=self.batch_size)
+        get_search_backend().index_many(unchanged)
+        similarity.rebuild(unchanged, batch_size=self.batch_size)
+        projects_saved_in_bulk(Project.objects.filter(pk__in=changed))
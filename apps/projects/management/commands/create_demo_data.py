@@ -1,15 +1,154 @@
+import random
+import time
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from users.models import UserProfile
+from users.tags import rebuild_profile_tags
 from projects.models import Project
+from projects.signals import projects_saved_in_bulk
 
 User = get_user_model()
 
+SKILLS = [
+    'Python', 'Django', 'FastAPI', 'React', 'Vue.js', 'TypeScript', 'JavaScript', 'Node.js',
+    'PostgreSQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Terraform', 'Go',
+    'Rust', 'Swift', 'Kotlin', 'Flutter', 'React Native', 'Firebase', 'TensorFlow',
+    'Figma', 'CSS', 'GraphQL', 'Solidity', 'WebRTC', 'Elixir', 'Java',
+]
+ROLES = [
+    'Backend Developer', 'Frontend Developer', 'Full-stack Developer', 'Mobile Developer',
+    'DevOps Engineer', 'UI Designer', 'UX Designer', 'Machine Learning Engineer',
+    'Security Engineer', 'Data Engineer', 'Product Manager', 'QA Engineer',
+]
+INTERESTS = [
+    'Web Development', 'Machine Learning', 'Open Source', 'Mobile Development',
+    'Cloud Computing', 'Design Systems', 'Accessibility', 'Security', 'Games', 'Education',
+]
+TITLE_WORDS = (
+    ['Smart', 'Open', 'Green', 'Rapid', 'Social', 'Secure', 'Tiny', 'Global'],
+    ['Recipe', 'Fitness', 'Budget', 'Chat', 'Voting', 'Event', 'Learning', 'Travel', 'Music'],
+    ['Tracker', 'Platform', 'Assistant', 'Dashboard', 'API', 'Marketplace', 'Bot'],
+)
+
 
 class Command(BaseCommand):
     help = 'Create demo users and projects'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0, help='Generate this many synthetic users')
+        parser.add_argument('--projects', type=int, default=0, help='Generate this many synthetic projects')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; reruns with the same seed are idempotent')
+        parser.add_argument('--members', type=int, default=3, help='Maximum members per synthetic project')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
     def handle(self, *args, **options):
+        if options['users'] or options['projects']:
+            self.seed_synthetic(options)
+        else:
+            self.create_demo_records()
+
+    def seed_synthetic(self, options):
+        started = time.monotonic()
+        rng = random.Random(options['seed'])
+        prefix = f'seed{options["seed"]}_'
+        batch_size = options['batch_size']
+
+        created_users = self.seed_users(rng, prefix, options['users'], batch_size)
+        profile_ids = list(
+            UserProfile.objects.filter(user__username__startswith=prefix)
+            .order_by('user_id').values_list('pk', flat=True)
+        )
+        created_projects = 0
+        if options['projects']:
+            if not profile_ids:
+                self.stdout.write(self.style.ERROR('Seed users first: projects need creators'))
+                return
+            created_projects = self.seed_projects(
+                rng, prefix, options['projects'], profile_ids, options['members'], batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {created_users} users and {created_projects} projects '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
+
+    def seed_users(self, rng, prefix, count, batch_size):
+        # hashing is deliberately slow; every synthetic user shares one hash
+        password = make_password('demo123')
+        created = 0
+        for start in range(0, count, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, count)):
+                # draw for every row, even skipped ones, so reruns stay deterministic
+                rows.append((f'{prefix}user{i}', {
+                    'bio': f'Synthetic profile #{i}',
+                    'skills': rng.sample(SKILLS, rng.randint(2, 6)),
+                    'interests': rng.sample(INTERESTS, rng.randint(1, 3)),
+                    'availability_hours': rng.randint(5, 40),
+                    'preferred_roles': rng.sample(ROLES, rng.randint(1, 3)),
+                }))
+            existing = set(
+                User.objects.filter(username__in=[name for name, _ in rows]).values_list('username', flat=True)
+            )
+            rows = [(name, profile) for name, profile in rows if name not in existing]
+            if not rows:
+                continue
+            with transaction.atomic():
+                User.objects.bulk_create([
+                    User(username=name, email=f'{name}@example.com', password=password)
+                    for name, _ in rows
+                ])
+                user_ids = dict(
+                    User.objects.filter(username__in=[name for name, _ in rows]).values_list('username', 'pk')
+                )
+                UserProfile.objects.bulk_create([
+                    UserProfile(user_id=user_ids[name], **profile) for name, profile in rows
+                ])
+                rebuild_profile_tags(UserProfile.objects.filter(user_id__in=user_ids.values()), batch_size=batch_size)
+            created += len(rows)
+        return created
+
+    def seed_projects(self, rng, prefix, count, profile_ids, max_members, batch_size):
+        Membership = Project.members.through
+        created = 0
+        for start in range(0, count, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, count)):
+                title = f'{" ".join(rng.choice(words) for words in TITLE_WORDS)} ({prefix}{i})'
+                creator = rng.choice(profile_ids)
+                members = rng.sample(profile_ids, min(len(profile_ids), rng.randint(0, max_members)))
+                rows.append((title, Project(
+                    title=title,
+                    description=f'{title} is a synthetic project for load testing.',
+                    tech_stack=rng.sample(SKILLS, rng.randint(2, 5)),
+                    needed_roles=rng.sample(ROLES, rng.randint(1, 3)),
+                    created_by_id=creator,
+                ), {creator, *members}))
+            existing = set(
+                Project.objects.filter(title__in=[title for title, _, _ in rows]).values_list('title', flat=True)
+            )
+            rows = [row for row in rows if row[0] not in existing]
+            if not rows:
+                continue
+            with transaction.atomic():
+                Project.objects.bulk_create([project for _, project, _ in rows])
+                project_ids = dict(
+                    Project.objects.filter(title__in=[title for title, _, _ in rows]).values_list('title', 'pk')
+                )
+                Membership.objects.bulk_create([
+                    Membership(project_id=project_ids[title], userprofile_id=member)
+                    for title, _, members in rows
+                    for member in members
+                ], ignore_conflicts=True)
+                # bulk_create skips post_save
+                projects_saved_in_bulk(Project.objects.filter(pk__in=project_ids.values()))
+            created += len(rows)
+        return created
+
+    def create_demo_records(self):
         # Create demo users
         demo_users = [
             {
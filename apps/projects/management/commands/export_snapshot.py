@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from projects.snapshot import PROFILE, PROJECT, export_snapshot, open_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Stream profiles and projects (with memberships) to an NDJSON file; a .gz path is gzipped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Output file, or '-' for stdout")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--only', choices=[PROFILE, PROJECT], help='Export a single record type')
+        parser.add_argument('--with-passwords', action='store_true', help='Include password hashes')
+
+    def handle(self, *args, **options):
+        include = (options['only'],) if options['only'] else (PROFILE, PROJECT)
+        stream = open_snapshot(options['path'], 'w')
+        try:
+            written = export_snapshot(
+                stream, chunk_size=options['chunk_size'],
+                with_passwords=options['with_passwords'], include=include,
+            )
+        finally:
+            if options['path'] != '-':
+                stream.close()
+        self.stderr.write(self.style.SUCCESS(f'Exported {written} records'))
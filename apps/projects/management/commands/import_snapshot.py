@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from projects.snapshot import import_snapshot, open_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Upsert profiles and projects from an NDJSON snapshot; a .gz path is read as gzip'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Snapshot file, or '-' for stdin")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        stream = open_snapshot(options['path'], 'r')
+        try:
+            result = import_snapshot(stream, batch_size=options['batch_size'])
+        finally:
+            if options['path'] != '-':
+                stream.close()
+        for line_number, message in result.errors:
+            self.stderr.write(self.style.WARNING(f'line {line_number}: {message}'))
+        if result.skipped > len(result.errors):
+            self.stderr.write(self.style.WARNING(f'... {result.skipped - len(result.errors)} more skipped'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.profiles} profiles and {result.projects} projects, skipped {result.skipped} records'
+        ))
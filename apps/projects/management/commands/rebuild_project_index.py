@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from projects import similarity
+from projects.index import rebuild_index
+from projects.models import Project
+from projects.search import get_backend as get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the skill/role token index, the search index and the similarity index for all projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} projects'))
+        get_search_backend().rebuild(Project.objects.all())
+        self.stdout.write(self.style.SUCCESS('Rebuilt search index'))
+        changed = similarity.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {changed} similarity signatures'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from projects.recommendations import evict_expired, refresh_recommendations
+from users.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Recompute stale project recommendations and evict expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute lists for every profile')
+
+    def handle(self, *args, **options):
+        evicted = evict_expired()
+        if options['all']:
+            profiles = UserProfile.objects.all()
+        else:
+            profiles = UserProfile.objects.filter(recommendations__is_stale=True)
+        refreshed = 0
+        for profile in profiles.iterator(chunk_size=500):
+            refresh_recommendations(profile)
+            refreshed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed {refreshed} recommendation lists, evicted {evicted}'
+        ))
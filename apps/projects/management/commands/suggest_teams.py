@@ -0,0 +1,26 @@
+import json
+
+from django.core.management.base import BaseCommand
+from projects.teams import DEFAULT_HOURS_PER_ROLE, DEFAULT_POOL_SIZE, TeamBuilder, open_projects
+
+
+class Command(BaseCommand):
+    help = 'Suggest a team for every project with open roles; writes one JSON object per project'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=DEFAULT_HOURS_PER_ROLE, help='Hours each role needs')
+        parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE, help='Candidates kept per role')
+        parser.add_argument('--include-members', action='store_true', help='Let current members fill roles')
+
+    def handle(self, *args, **options):
+        builder = TeamBuilder(hours_per_role=options['hours'], pool_size=options['pool_size'])
+        count = 0
+        for team in builder.build_many(open_projects().iterator(chunk_size=500),
+                                       exclude_members=not options['include_members']):
+            self.stdout.write(json.dumps({
+                'project': team.project_id,
+                'score': round(team.score, 6),
+                'roles': [[a.role, a.profile_id, round(a.score, 6)] for a in team.roles],
+            }))
+            count += 1
+        self.stderr.write(self.style.SUCCESS(f'Suggested teams for {count} projects'))
@@ -1,2 +1,193 @@
-def calculate_match_score():
-    pass
\ No newline at end of file
+"""
+Profile/project match scoring.
+
+Profiles and projects are turned into sparse feature vectors over a shared
+vocabulary (``skill:<name>`` and ``role:<name>`` tokens) and scored with a
+single sparse matrix product, so scoring one profile against every project,
+or many profiles against many projects, never loops over the JSON lists.
+Scores are cosine similarities in the range [0, 1].
+"""
+import numpy as np
+from scipy import sparse
+
+from users.tags import normalize_tag
+
+SKILL_WEIGHT = 1.0
+INTEREST_WEIGHT = 0.5
+ROLE_WEIGHT = 1.0
+
+
+def normalize_token(value):
+    return normalize_tag(value)
+
+
+def _field(obj, name):
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _add(features, token, weight):
+    # a tag listed twice (or as both skill and interest) keeps its highest weight
+    if weight > features.get(token, 0.0):
+        features[token] = weight
+
+
+def profile_features(profile):
+    features = {}
+    for skill in _field(profile, 'skills') or []:
+        _add(features, 'skill:' + normalize_token(skill), SKILL_WEIGHT)
+    for interest in _field(profile, 'interests') or []:
+        _add(features, 'skill:' + normalize_token(interest), INTEREST_WEIGHT)
+    for role in _field(profile, 'preferred_roles') or []:
+        _add(features, 'role:' + normalize_token(role), ROLE_WEIGHT)
+    return features
+
+
+def project_features(project):
+    features = {}
+    for tech in _field(project, 'tech_stack') or []:
+        _add(features, 'skill:' + normalize_token(tech), SKILL_WEIGHT)
+    for role in _field(project, 'needed_roles') or []:
+        _add(features, 'role:' + normalize_token(role), ROLE_WEIGHT)
+    return features
+
+
+class Vocabulary:
+    def __init__(self):
+        self._index = {}
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, token):
+        return token in self._index
+
+    def get(self, token):
+        return self._index.get(token)
+
+    def add(self, token):
+        index = self._index.get(token)
+        if index is None:
+            index = self._index[token] = len(self._index)
+        return index
+
+
+def build_matrix(feature_rows, vocabulary, grow=False):
+    """
+    Stack feature dicts into an L2-normalised CSR matrix.
+
+    With ``grow=False`` tokens missing from ``vocabulary`` are dropped: they
+    cannot match anything on the other side of the product anyway. Rows are
+    still normalised over all of their features so a score does not depend on
+    which other rows share the vocabulary.
+    """
+    indptr = [0]
+    indices = []
+    data = []
+    norms = []
+    lookup = vocabulary.add if grow else vocabulary.get
+    for features in feature_rows:
+        norm = 0.0
+        for token, weight in features.items():
+            norm += weight * weight
+            index = lookup(token)
+            if index is not None:
+                indices.append(index)
+                data.append(weight)
+        norms.append(np.sqrt(norm) or 1.0)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary)),
+    )
+    return sparse.diags(1.0 / np.asarray(norms, dtype=np.float64)).dot(matrix).tocsr()
+
+
+def top_k_indices(scores, k):
+    """Indices of the ``k`` largest ``scores``, best first, without a full sort."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class MatchEngine:
+    """
+    Scores profiles against a fixed set of projects.
+
+    The project matrix is built once; every ``score``/``top_k`` call is a
+    single sparse product against it. ``projects`` may be model instances or
+    dicts with ``id``, ``tech_stack`` and ``needed_roles``.
+    """
+
+    def __init__(self, projects):
+        projects = list(projects)
+        self.vocabulary = Vocabulary()
+        self.project_ids = np.asarray([_field(p, 'id') or 0 for p in projects], dtype=np.int64)
+        self.matrix = build_matrix(
+            (project_features(p) for p in projects), self.vocabulary, grow=True
+        )
+        self._positions = None
+
+    @classmethod
+    def from_queryset(cls, queryset=None):
+        if queryset is None:
+            from .models import Project
+            queryset = Project.objects.all()
+        return cls(queryset.values('id', 'tech_stack', 'needed_roles'))
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def position(self, project_id):
+        if self._positions is None:
+            self._positions = {pid: i for i, pid in enumerate(self.project_ids.tolist())}
+        return self._positions.get(project_id)
+
+    def profile_matrix(self, profiles):
+        return build_matrix((profile_features(p) for p in profiles), self.vocabulary)
+
+    def score_matrix(self, profiles):
+        """Sparse (n_profiles x n_projects) score matrix."""
+        return self.profile_matrix(profiles).dot(self.matrix.T).tocsr()
+
+    def score(self, profile):
+        """Dense score vector of one profile against every project."""
+        return self.score_matrix([profile]).toarray().ravel()
+
+    def top_k(self, profile, k=10, exclude=()):
+        return self.top_k_many([profile], k=k, exclude=[exclude])[0]
+
+    def top_k_many(self, profiles, k=10, exclude=None):
+        """
+        Best ``k`` ``(project_id, score)`` pairs per profile.
+
+        Only projects sharing at least one token with the profile are
+        considered. ``exclude`` is an optional per-profile iterable of
+        project ids to leave out (e.g. projects already joined).
+        """
+        scores = self.score_matrix(profiles)
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            columns = scores.indices[start:end]
+            values = scores.data[start:end]
+            if exclude is not None and exclude[row]:
+                keep = ~np.isin(self.project_ids[columns], np.fromiter(exclude[row], dtype=np.int64))
+                columns, values = columns[keep], values[keep]
+            best = top_k_indices(values, k)
+            results.append([
+                (int(pid), float(score))
+                for pid, score in zip(self.project_ids[columns[best]], values[best])
+            ])
+        return results
+
+
+def calculate_match_score(profile, project):
+    """Cosine match score between a single profile and a single project."""
+    return float(MatchEngine([project]).score(profile)[0]) if project_features(project) else 0.0
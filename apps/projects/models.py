@@ -1,5 +1,47 @@
-from django.db import models
-from users.models import UserProfile
+from django.db import models, transaction
+from django.db.models import Count, Q
+from users.models import Role, Skill, UserProfile
+
+
+class OwnProject(ValueError):
+    pass
+
+
+class ProjectQuerySet(models.QuerySet):
+    def for_listing(self, fields=None):
+        """
+        Everything list pages and ProjectSerializer touch, in a fixed number
+        of queries. ``fields`` limits the work to a sparse fieldset.
+        """
+        queryset = self.select_related('created_by__user')
+        if fields is None or 'members' in fields:
+            queryset = queryset.prefetch_related('members')
+        if fields is None or 'member_count' in fields:
+            queryset = queryset.annotate(member_count=Count('members', distinct=True))
+        if fields is not None and 'description' not in fields:
+            queryset = queryset.defer('description')
+        return queryset
+
+    def for_detail(self):
+        return self.for_listing().prefetch_related('members__user')
+
+    def with_skill(self, name):
+        from users.tags import normalize_tag
+        return self.filter(
+            pk__in=ProjectSkill.objects.filter(skill__normalized=normalize_tag(name)).values('project_id')
+        )
+
+    def with_role(self, name):
+        from users.tags import normalize_tag
+        return self.filter(
+            pk__in=ProjectRole.objects.filter(role__normalized=normalize_tag(name)).values('project_id')
+        )
+
+    def for_profile(self, profile):
+        """Projects created or joined by ``profile``, without a join-and-distinct."""
+        joined = Project.members.through.objects.filter(userprofile=profile).values('project_id')
+        return self.filter(Q(created_by=profile) | Q(pk__in=joined))
+
 
 class Project(models.Model):
     title = models.CharField(max_length=100)
@@ -9,3 +51,153 @@ class Project(models.Model):
     created_by = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
     members = models.ManyToManyField(UserProfile, related_name="projects_joined", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination order, see ProjectCursorPagination
+            models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+            # a creator's projects, newest first
+            models.Index(fields=['created_by', '-created_at'], name='project_creator_created_idx'),
+        ]
+
+    def has_member(self, profile):
+        """Membership test via the through table's unique index, not a members scan."""
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('members')
+        if prefetched is not None:
+            return any(member.pk == profile.pk for member in prefetched)
+        return Project.members.through.objects.filter(project_id=self.pk, userprofile_id=profile.pk).exists()
+
+    def toggle_member(self, profile):
+        """
+        Join or leave in one transaction; returns True if ``profile`` is now a
+        member. The project row lock serialises concurrent toggles (e.g. a
+        double-click) on backends that support SELECT ... FOR UPDATE.
+        """
+        with transaction.atomic():
+            self._lock()
+            if self._is_member(profile):
+                self.members.remove(profile)
+                return False
+            self.members.add(profile)
+            return True
+
+    def add_member(self, profile):
+        """
+        Join under the same row lock as ``toggle_member``; returns True if
+        ``profile`` was not a member yet. Creators cannot join their own
+        project.
+        """
+        if self.created_by_id == profile.pk:
+            raise OwnProject('You cannot join your own project.')
+        with transaction.atomic():
+            self._lock()
+            if self._is_member(profile):
+                return False
+            self.members.add(profile)
+            return True
+
+    def _lock(self):
+        list(Project.objects.select_for_update().filter(pk=self.pk).values_list('pk', flat=True))
+
+    def _is_member(self, profile):
+        return Project.members.through.objects.filter(project_id=self.pk, userprofile_id=profile.pk).exists()
+
+
+class ProjectSkill(models.Model):
+    """Indexed mirror of ``Project.tech_stack``, kept in sync by ``projects.index``."""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='project_skills')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'project'], name='unique_project_skill'),
+        ]
+
+
+class ProjectRole(models.Model):
+    """Indexed mirror of ``Project.needed_roles``."""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_roles')
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='project_roles')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['role', 'project'], name='unique_project_role'),
+        ]
+
+
+class ProfileRecommendations(models.Model):
+    """
+    Precomputed top-N project recommendations for a profile.
+
+    ``items`` holds ``[project_id, score]`` pairs, best first. Rows are marked
+    stale by signal handlers and recomputed lazily (see ``projects.recommendations``).
+    """
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='recommendations')
+    items = models.JSONField(default=list)
+    computed_at = models.DateTimeField(db_index=True)
+    is_stale = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'Recommendations for {self.profile}'
+
+
+class ProjectSignature(models.Model):
+    """MinHash signature of a project's tags and description (see ``projects.similarity``)."""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    minhash = models.BinaryField()
+
+    def __str__(self):
+        return f'Signature for {self.project_id}'
+
+
+class ProjectBucket(models.Model):
+    """One LSH band of a project's signature; projects sharing a bucket are candidate neighbours."""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='lsh_buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'band'], name='unique_project_band'),
+        ]
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='project_lsh_bucket_idx'),
+        ]
+
+
+class SwipeEvent(models.Model):
+    """A profile's swipe on a project in the feed; swiping again replaces it."""
+    LIKE = 'like'
+    PASS = 'pass'
+    DIRECTIONS = [(LIKE, 'Like'), (PASS, 'Pass')]
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='swipes')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='swipes')
+    direction = models.CharField(max_length=4, choices=DIRECTIONS)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'project'], name='unique_swipe'),
+        ]
+
+    def __str__(self):
+        return f'{self.profile} {self.direction} {self.project_id}'
+
+
+class FeedQueue(models.Model):
+    """
+    A profile's precomputed swipe feed: ``items`` holds ``[project_id, score]``
+    pairs, best first. ``generation`` changes on every rebuild so continuation
+    tokens from an older queue are recognised (see ``projects.feed``).
+    """
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='feed_queue')
+    items = models.JSONField(default=list)
+    generation = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(db_index=True)
+    is_stale = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'Feed for {self.profile}'
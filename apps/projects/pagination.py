@@ -0,0 +1,20 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class ProjectCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(created_at, id)``, newest first. Every page is
+    an indexed range scan, so deep pages cost the same as the first one.
+
+    ``apaginate_queryset`` is the async counterpart of ``paginate_queryset``;
+    both produce the same cursors.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # the async ORM runs its queries on the same thread-sensitive executor
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
@@ -0,0 +1,97 @@
+"""
+Per-profile recommendation cache.
+
+Top-N lists are stored in ``ProfileRecommendations`` and only recomputed when
+they are missing, expired, or were marked stale because the profile, one of
+its candidate projects, or its memberships changed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .index import candidates_for_profile, sharing_tags
+from .matching import MatchEngine
+from .models import Project, ProfileRecommendations
+
+DEFAULTS = {
+    'TOP_N': 20,
+    'CANDIDATES': 500,
+    'TTL': 15 * 60,
+    'MAX_PROFILES': 10000,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'PROJECT_RECOMMENDATIONS', {}).get(name, DEFAULTS[name])
+
+
+def excluded_project_ids(profile):
+    return set(
+        Project.objects.filter(Q(created_by=profile) | Q(members=profile)).values_list('pk', flat=True)
+    )
+
+
+def compute_recommendations(profile, limit=None):
+    limit = limit or get_setting('TOP_N')
+    candidates = candidates_for_profile(profile, limit=get_setting('CANDIDATES'))
+    if not candidates:
+        return []
+    engine = MatchEngine.from_queryset(Project.objects.filter(pk__in=candidates))
+    return engine.top_k(profile, k=limit, exclude=excluded_project_ids(profile))
+
+
+def refresh_recommendations(profile):
+    items = [[pid, round(score, 6)] for pid, score in compute_recommendations(profile)]
+    entry, _ = ProfileRecommendations.objects.update_or_create(
+        profile=profile,
+        defaults={'items': items, 'computed_at': timezone.now(), 'is_stale': False},
+    )
+    enforce_size_limit()
+    return entry
+
+
+def is_expired(entry, now=None):
+    now = now or timezone.now()
+    return entry.computed_at < now - timedelta(seconds=get_setting('TTL'))
+
+
+def get_recommendations(profile):
+    """``[(project_id, score), ...]`` for ``profile``, recomputing only if needed."""
+    entry = ProfileRecommendations.objects.filter(profile=profile).first()
+    if entry is None or entry.is_stale or is_expired(entry):
+        entry = refresh_recommendations(profile)
+    return [(pid, score) for pid, score in entry.items]
+
+
+def invalidate_profiles(profile_ids):
+    profile_ids = [pid for pid in profile_ids if pid is not None]
+    if profile_ids:
+        ProfileRecommendations.objects.filter(profile_id__in=profile_ids).update(is_stale=True)
+
+
+def projects_changed(skill_ids, role_ids, creator_ids=()):
+    """
+    Mark stale the cached lists that projects tagged with ``skill_ids`` /
+    ``role_ids`` (before or after a change) can enter or already be part
+    of. Those are the lists of profiles sharing one of the tags, plus the
+    creators' lists. The lists are rescored on their next read.
+    """
+    condition = sharing_tags(skill_ids, role_ids) | Q(profile_id__in=[pk for pk in creator_ids if pk is not None])
+    ProfileRecommendations.objects.filter(condition, is_stale=False).update(is_stale=True)
+
+
+def evict_expired():
+    cutoff = timezone.now() - timedelta(seconds=get_setting('TTL'))
+    deleted, _ = ProfileRecommendations.objects.filter(computed_at__lt=cutoff).delete()
+    return deleted
+
+
+def enforce_size_limit():
+    """Drop the least recently computed lists beyond ``MAX_PROFILES``."""
+    limit = get_setting('MAX_PROFILES')
+    overflow = ProfileRecommendations.objects.order_by('-computed_at').values_list('pk', flat=True)[limit:limit + 1000]
+    overflow = list(overflow)
+    if overflow:
+        ProfileRecommendations.objects.filter(pk__in=overflow).delete()
@@ -0,0 +1,184 @@
+"""
+Ranked full-text search over projects.
+
+``get_backend()`` returns the backend named by ``settings.PROJECT_SEARCH_BACKEND``
+(a dotted path), defaulting to SQLite FTS5 on SQLite and to the skill/role
+token index elsewhere. Backends are kept up to date from the Project save and
+delete signals, so a query never scans the project table.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .index import candidate_project_ids
+from .matching import normalize_token
+
+WORD_RE = re.compile(r'\w[\w.+#-]*', re.UNICODE)
+
+
+class BaseSearchBackend:
+    def index(self, project):
+        raise NotImplementedError
+
+    def remove(self, project_id):
+        raise NotImplementedError
+
+    def search(self, query, limit=20):
+        """``[(project_id, score), ...]``, most relevant first."""
+        raise NotImplementedError
+
+    def index_many(self, queryset):
+        for project in queryset.iterator(chunk_size=1000):
+            self.index(project)
+
+    def rebuild(self, queryset):
+        self.index_many(queryset)
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    FTS5 virtual table keyed by project id (``rowid``), ranked with bm25.
+    The table cannot be expressed as a model; it is created after ``migrate``
+    (see ``projects.signals``) and, defensively, on first use.
+    """
+    table = 'projects_project_fts'
+    # bm25 column weights: title, description, tech_stack, needed_roles
+    weights = (10.0, 1.0, 5.0, 5.0)
+
+    def __init__(self):
+        self._ready = set()
+
+    def ensure_schema(self):
+        key = connection.settings_dict['NAME']
+        if key in self._ready:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+                "title, description, tech_stack, needed_roles, tokenize='porter unicode61')"
+            )
+        if not connection.in_atomic_block:
+            # DDL inside a transaction may still be rolled back
+            self._ready.add(key)
+
+    def index(self, project):
+        self.ensure_schema()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [project.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description, tech_stack, needed_roles) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [
+                    project.pk,
+                    project.title,
+                    project.description,
+                    ' '.join(project.tech_stack or []),
+                    ' '.join(project.needed_roles or []),
+                ],
+            )
+
+    def index_many(self, queryset):
+        self.ensure_schema()
+        rows = queryset.values_list('pk', 'title', 'description', 'tech_stack', 'needed_roles')
+        batch = []
+        for row in rows.iterator(chunk_size=1000):
+            batch.append(row)
+            if len(batch) >= 1000:
+                self._insert_many(batch)
+                batch = []
+        if batch:
+            self._insert_many(batch)
+
+    def _insert_many(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[row[0]] for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, description, tech_stack, needed_roles) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [
+                    [pk, title, description, ' '.join(tech_stack or []), ' '.join(needed_roles or [])]
+                    for pk, title, description, tech_stack, needed_roles in rows
+                ],
+            )
+
+    def remove(self, project_id):
+        self.ensure_schema()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [project_id])
+
+    def rebuild(self, queryset):
+        self.ensure_schema()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        super().rebuild(queryset)
+
+    @staticmethod
+    def build_query(query):
+        # every word must match, as a prefix; quoting neutralises FTS5 syntax
+        words = WORD_RE.findall(query)
+        return ' '.join('"%s"*' % word.replace('"', '""') for word in words)
+
+    def search(self, query, limit=20):
+        match = self.build_query(query)
+        if not match:
+            return []
+        self.ensure_schema()
+        weights = ', '.join(str(w) for w in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, bm25({self.table}, {weights}) AS rank FROM {self.table} '
+                f'WHERE {self.table} MATCH %s ORDER BY rank LIMIT %s',
+                [match, limit],
+            )
+            # bm25 is lower-is-better; flip it so higher scores are more relevant
+            return [(row[0], -row[1]) for row in cursor.fetchall()]
+
+
+class TokenIndexSearchBackend(BaseSearchBackend):
+    """
+    Fallback for databases without FTS5: matches query words and phrases
+    against the skill/role token index. Titles and descriptions are not searched.
+    """
+
+    def index(self, project):
+        # ProjectSkill/ProjectRole rows are maintained by projects.index
+        pass
+
+    def remove(self, project_id):
+        pass
+
+    def index_many(self, queryset):
+        pass
+
+    def rebuild(self, queryset):
+        pass
+
+    def search(self, query, limit=20):
+        words = [normalize_token(word) for word in WORD_RE.findall(query)]
+        terms = set(words) | {' '.join(words)}
+        tokens = [f'{kind}:{term}' for term in terms if term for kind in ('skill', 'role')]
+        ids = candidate_project_ids(tokens, limit=limit)
+        return [(pid, float(len(ids) - rank)) for rank, pid in enumerate(ids)]
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'PROJECT_SEARCH_BACKEND', None)
+        if path is None:
+            path = (
+                'projects.search.SQLiteFTS5Backend'
+                if connection.vendor == 'sqlite'
+                else 'projects.search.TokenIndexSearchBackend'
+            )
+        _backend = import_string(path)()
+    return _backend
+
+
+def search_projects(query, limit=20):
+    return get_backend().search(query, limit=limit)
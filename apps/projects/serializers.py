@@ -1,9 +1,153 @@
 from rest_framework import serializers
-from .models import Project
+from .models import Project, SwipeEvent
+from django.db import transaction
+from users.canonical import canonicalize_list
+
+def requested_fields(request):
+    """Field names from a ``?fields=a,b`` query parameter, or None for all fields."""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    raw = request.GET.get('fields')
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Limit serialized output to the fields named in ``?fields=`` on reads."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    member_count = serializers.SerializerMethodField()
 
-class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'tech_stack', 'needed_roles', 'created_by', 'members', 'created_at']
+        fields = ['id', 'title', 'description', 'tech_stack', 'needed_roles', 'created_by', 'members', 'member_count', 'created_at']
         read_only_fields = ['id', 'created_at', 'created_by', 'members']
-    
\ No newline at end of file
+
+    def validate_tech_stack(self, value):
+        return canonicalize_list(value)
+
+    def validate_needed_roles(self, value):
+        return canonicalize_list(value)
+
+    def get_member_count(self, obj):
+        # annotated by Project.objects.for_listing(); fall back for fresh instances
+        count = getattr(obj, 'member_count', None)
+        return count if count is not None else len(obj.members.all())
+
+
+class ProjectBulkListSerializer(serializers.ListSerializer):
+    """
+    Validates many project creates, or many partial updates when ``instance``
+    is a ``{pk: project}`` mapping, and writes them with ``bulk_create`` /
+    ``bulk_update``. Items of an update must carry their ``id``.
+    """
+    max_length = 500
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', self.max_length)
+        super().__init__(*args, **kwargs)
+        self.targets = []
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            pk = data.get('id') if isinstance(data, dict) else None
+            instance = self.instance.get(pk) if isinstance(pk, int) else None
+            if instance is None:
+                raise serializers.ValidationError({'id': ['Unknown project id.']})
+            can_edit = self.context.get('can_edit')
+            if can_edit is not None and not can_edit(instance):
+                raise serializers.ValidationError({'id': ['You do not have permission to edit this project.']})
+            self.child.instance = instance
+            self.child.initial_data = data
+            self.targets.append(instance)
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        projects = [Project(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            return Project.objects.bulk_create(projects, batch_size=self.max_length)
+
+    def update(self, instance, validated_data):
+        fields = set()
+        for project, attrs in zip(self.targets, validated_data):
+            for name, value in attrs.items():
+                setattr(project, name, value)
+            fields.update(attrs)
+        if fields:
+            with transaction.atomic():
+                Project.objects.bulk_update(self.targets, sorted(fields), batch_size=self.max_length)
+        return self.targets
+
+
+class RecommendedProjectSerializer(ProjectSerializer):
+    match_score = serializers.SerializerMethodField()
+
+    class Meta(ProjectSerializer.Meta):
+        fields = ProjectSerializer.Meta.fields + ['match_score']
+
+    def get_match_score(self, obj):
+        return self.context.get('scores', {}).get(obj.pk)
+
+
+class SimilarProjectSerializer(ProjectSerializer):
+    similarity = serializers.SerializerMethodField()
+
+    class Meta(ProjectSerializer.Meta):
+        fields = ProjectSerializer.Meta.fields + ['similarity']
+
+    def get_similarity(self, obj):
+        return self.context.get('similarity', {}).get(obj.pk)
+
+
+class SwipeSerializer(serializers.Serializer):
+    project = serializers.IntegerField()
+    direction = serializers.ChoiceField(choices=SwipeEvent.DIRECTIONS)
+
+
+class MembershipBulkSerializer(serializers.Serializer):
+    join = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    leave = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, data):
+        if set(data['join']) & set(data['leave']):
+            raise serializers.ValidationError('A project cannot be both joined and left.')
+        if not data['join'] and not data['leave']:
+            raise serializers.ValidationError('Provide project ids to join or leave.')
+        return data
+
+
+class TeamMemberSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    username = serializers.CharField(source='user.username')
+    availability_hours = serializers.IntegerField()
+    skills = serializers.ListField(child=serializers.CharField())
+    preferred_roles = serializers.ListField(child=serializers.CharField())
+
+
+def serialize_team(team, profiles):
+    """``team`` (a ``projects.teams.Team``) as API data; ``profiles`` maps id to UserProfile."""
+    return {
+        'project': team.project_id,
+        'score': round(team.score, 6),
+        'unfilled': team.unfilled,
+        'roles': [
+            {
+                'role': assignment.role,
+                'score': round(assignment.score, 6),
+                'profile': (
+                    TeamMemberSerializer(profiles[assignment.profile_id]).data
+                    if assignment.profile_id is not None else None
+                ),
+            }
+            for assignment in team.roles
+        ],
+    }
@@ -0,0 +1,105 @@
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from users.models import UserProfile
+from users.signals import profile_tags_changed, username_changed
+from . import cache as project_cache, feed, recommendations, similarity
+from .index import index_project, project_tag_ids, rebuild_index
+from .search import SQLiteFTS5Backend, get_backend as get_search_backend
+from .models import Project
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    project_cache.invalidate_projects([instance.pk])
+    get_search_backend().index(instance)
+    similarity.index_project(instance)
+    tags = index_project(instance)
+    if tags or created:
+        skill_ids, role_ids = tags or (set(), set())
+        recommendations.projects_changed(skill_ids, role_ids, [instance.created_by_id])
+        feed.projects_changed(skill_ids, role_ids)
+
+
+def projects_saved_in_bulk(projects):
+    """What ``project_saved`` does, for projects written with ``bulk_create``/``bulk_update``."""
+    projects = list(projects)
+    if not projects:
+        return
+    ids = [project.pk for project in projects]
+    old_skills, old_roles = project_tag_ids(ids)
+    project_cache.invalidate_projects(ids)
+    saved = Project.objects.filter(pk__in=ids)
+    get_search_backend().index_many(saved)
+    rebuild_index(saved, batch_size=len(ids))
+    similarity.index_many(projects)
+    skill_ids, role_ids = project_tag_ids(ids)
+    recommendations.projects_changed(
+        old_skills | skill_ids, old_roles | role_ids, {project.created_by_id for project in projects},
+    )
+    feed.projects_changed(old_skills | skill_ids, old_roles | role_ids)
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleting(sender, instance, **kwargs):
+    # the tag index rows are cascaded away before post_delete
+    instance._tag_ids = project_tag_ids([instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    project_cache.invalidate_projects([instance.pk])
+    get_search_backend().remove(instance.pk)
+    skill_ids, role_ids = getattr(instance, '_tag_ids', (set(), set()))
+    recommendations.projects_changed(skill_ids, role_ids)
+
+
+@receiver(profile_tags_changed)
+def profile_tags_updated(sender, instance, created, **kwargs):
+    if not created:
+        recommendations.invalidate_profiles([instance.pk])
+        feed.invalidate_profiles([instance.pk])
+
+
+@receiver(username_changed)
+def username_updated(sender, instance, **kwargs):
+    # project pages and fragments show creator and member names
+    profile_id = UserProfile.objects.filter(user_id=instance.pk).values_list('pk', flat=True).first()
+    if profile_id is not None:
+        project_cache.invalidate_projects(list(Project.objects.for_profile(profile_id).values_list('pk', flat=True)))
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_project_ids = list(instance.projects_joined.values_list('pk', flat=True))
+        else:
+            instance._cleared_member_ids = list(instance.members.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # instance is the profile whose memberships changed
+        recommendations.invalidate_profiles([instance.pk])
+        if action == 'post_clear':
+            project_cache.invalidate_projects(getattr(instance, '_cleared_project_ids', []))
+        else:
+            project_cache.invalidate_projects(pk_set or [])
+    else:
+        project_cache.invalidate_projects([instance.pk])
+        if action == 'post_clear':
+            recommendations.invalidate_profiles(getattr(instance, '_cleared_member_ids', []))
+        else:
+            recommendations.invalidate_profiles(pk_set or [])
+
+
+@receiver(post_migrate)
+def create_search_schema(sender, using='default', **kwargs):
+    if sender.name != 'projects':
+        return
+    backend = get_search_backend()
+    if isinstance(backend, SQLiteFTS5Backend):
+        backend.ensure_schema()
@@ -0,0 +1,163 @@
+"""
+Similar projects via MinHash and locality-sensitive hashing.
+
+Each project is reduced to a set of shingles (its skill and role tokens plus
+word trigrams of its description) and summarised by a ``NUM_PERM``-value
+MinHash signature, whose agreement rate with another signature estimates the
+Jaccard similarity of the two shingle sets. The signature is cut into
+``BANDS`` bands; each band is hashed into ``ProjectBucket``. Projects that
+share any bucket are candidate neighbours, so a lookup reads a handful of
+indexed bucket rows and a bounded number of candidate signatures instead of
+comparing against every project.
+
+Signatures are refreshed from the project post_save handler and, for bulk
+writes, by ``index_many``.
+"""
+import hashlib
+import re
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Q
+
+from users.tags import normalize_tag
+from .models import Project, ProjectBucket, ProjectSignature
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+MAX_CANDIDATES = 200
+# ``(a * x + b) mod p`` over 32-bit shingle hashes, as in the classic MinHash
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_random = np.random.RandomState(1)
+_A = _random.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _random.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingles(project):
+    result = {'skill:' + normalize_tag(tech) for tech in project.tech_stack or [] if normalize_tag(tech)}
+    result |= {'role:' + normalize_tag(role) for role in project.needed_roles or [] if normalize_tag(role)}
+    words = _WORD_RE.findall((project.description or '').lower())
+    if len(words) < SHINGLE_SIZE:
+        result |= {'text:' + ' '.join(words)} if words else set()
+    else:
+        result |= {'text:' + ' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return result
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def signature(project):
+    """``NUM_PERM`` uint32 MinHash values, or None for a project with nothing to compare."""
+    values = shingles(project)
+    if not values:
+        return None
+    hashed = np.fromiter((_hash32(value) for value in values), dtype=np.uint64, count=len(values))
+    permuted = ((np.outer(hashed, _A) + _B) % _PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_buckets(minhash):
+    """One signed 64-bit bucket id per band."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(minhash[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+            'little', signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def estimated_similarity(a, b):
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _load(blob):
+    return np.frombuffer(bytes(blob), dtype=np.uint32)
+
+
+def index_project(project):
+    """Refresh ``project``'s signature and buckets; returns whether anything changed."""
+    return index_many([project]) > 0
+
+
+@transaction.atomic
+def index_many(projects):
+    """Refresh signatures for ``projects`` (instances); returns how many changed."""
+    projects = list(projects)
+    existing = {
+        row.project_id: _load(row.minhash)
+        for row in ProjectSignature.objects.filter(project_id__in=[p.pk for p in projects])
+    }
+    changed = []
+    removed = []
+    for project in projects:
+        minhash = signature(project)
+        old = existing.get(project.pk)
+        if minhash is None:
+            if old is not None:
+                removed.append(project.pk)
+        elif old is None or not np.array_equal(old, minhash):
+            changed.append((project.pk, minhash))
+    stale = removed + [pk for pk, _ in changed]
+    if not stale:
+        return 0
+    ProjectBucket.objects.filter(project_id__in=stale).delete()
+    ProjectSignature.objects.filter(project_id__in=removed).delete()
+    ProjectSignature.objects.bulk_create(
+        [ProjectSignature(project_id=pk, minhash=minhash.tobytes()) for pk, minhash in changed],
+        update_conflicts=True, unique_fields=['project'], update_fields=['minhash'],
+    )
+    ProjectBucket.objects.bulk_create([
+        ProjectBucket(project_id=pk, band=band, bucket=bucket)
+        for pk, minhash in changed
+        for band, bucket in enumerate(band_buckets(minhash))
+    ])
+    return len(stale)
+
+
+def rebuild(queryset=None, batch_size=1000):
+    """Re-sign every project in ``queryset`` (all by default) in batches."""
+    if queryset is None:
+        queryset = Project.objects.all()
+    rows = queryset.only('pk', 'description', 'tech_stack', 'needed_roles').order_by('pk')
+    total = 0
+    batch = []
+    for project in rows.iterator(chunk_size=batch_size):
+        batch.append(project)
+        if len(batch) >= batch_size:
+            total += index_many(batch)
+            batch = []
+    if batch:
+        total += index_many(batch)
+    return total
+
+
+def similar_project_ids(project_id, limit=10, min_similarity=0.0):
+    """``[(project_id, estimated_jaccard), ...]`` most similar first."""
+    own = ProjectSignature.objects.filter(project_id=project_id).first()
+    if own is None:
+        return []
+    minhash = _load(own.minhash)
+    bands = Q()
+    for band, bucket in enumerate(band_buckets(minhash)):
+        bands |= Q(band=band, bucket=bucket)
+    # the projects sharing the most bands are the likeliest close matches
+    candidates = list(
+        ProjectBucket.objects.filter(bands).exclude(project_id=project_id)
+        .values('project_id').annotate(shared=Count('id'))
+        .order_by('-shared', '-project_id').values_list('project_id', flat=True)[:MAX_CANDIDATES]
+    )
+    scored = [
+        (row.project_id, estimated_similarity(minhash, _load(row.minhash)))
+        for row in ProjectSignature.objects.filter(project_id__in=candidates)
+    ]
+    scored = [(pid, score) for pid, score in scored if score > min_similarity]
+    scored.sort(key=lambda item: (-item[1], -item[0]))
+    return scored[:limit]
@@ -0,0 +1,350 @@
+"""
+Streaming NDJSON snapshots of profiles and projects.
+
+A snapshot is one JSON object per line. Profile records come first and are
+keyed by username; project records follow and reference their creator and
+members by username, so a snapshot can be imported in a single pass into a
+database whose profile primary keys differ. Project ids are kept. Export reads with server-side
+``.iterator()`` and import writes in fixed-size batches, so memory use does
+not grow with the size of the tables.
+"""
+import gzip
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.utils.dateparse import parse_datetime
+from users.canonical import canonicalize_list
+from users.models import UserProfile
+from users.tags import rebuild_profile_tags
+
+from . import feed, recommendations
+from .models import Project
+from .signals import projects_saved_in_bulk
+
+User = get_user_model()
+
+PROFILE = 'profile'
+PROJECT = 'project'
+PROFILE_TAG_FIELDS = ('skills', 'interests', 'preferred_roles')
+PROJECT_TAG_FIELDS = ('tech_stack', 'needed_roles')
+
+
+class RecordError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    profiles: int = 0
+    projects: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+
+    def skip(self, line_number, message, max_errors=100):
+        self.skipped += 1
+        if len(self.errors) < max_errors:
+            self.errors.append((line_number, message))
+
+
+def open_snapshot(path, mode):
+    """Open ``path`` for text ``mode`` ('r' or 'w'); ``-`` is stdin/stdout, ``.gz`` is gzipped."""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8') if mode == 'r' else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _timestamp(value):
+    return value.isoformat() if value else None
+
+
+def export_profiles(chunk_size=2000, with_passwords=False):
+    fields = ['user__username', 'user__email', 'bio', 'availability_hours', 'created_at', *PROFILE_TAG_FIELDS]
+    if with_passwords:
+        fields.append('user__password')
+    rows = UserProfile.objects.order_by('pk').values(*fields).iterator(chunk_size=chunk_size)
+    for row in rows:
+        record = {
+            'type': PROFILE,
+            'username': row['user__username'],
+            'email': row['user__email'],
+            'bio': row['bio'],
+            'availability_hours': row['availability_hours'],
+            'created_at': _timestamp(row['created_at']),
+        }
+        record.update({name: row[name] for name in PROFILE_TAG_FIELDS})
+        if with_passwords:
+            record['password'] = row['user__password']
+        yield record
+
+
+def export_projects(chunk_size=2000):
+    Membership = Project.members.through
+    rows = (
+        Project.objects.order_by('pk')
+        .values('pk', 'title', 'description', 'created_at', 'created_by__user__username', *PROJECT_TAG_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in _chunks(rows, chunk_size):
+        members = {}
+        memberships = (
+            Membership.objects.filter(project_id__in=[row['pk'] for row in chunk])
+            .order_by('project_id', 'userprofile_id')
+            .values_list('project_id', 'userprofile__user__username')
+        )
+        for project_id, username in memberships:
+            members.setdefault(project_id, []).append(username)
+        for row in chunk:
+            record = {
+                'type': PROJECT,
+                'id': row['pk'],
+                'title': row['title'],
+                'description': row['description'],
+                'created_by': row['created_by__user__username'],
+                'created_at': _timestamp(row['created_at']),
+                'members': members.get(row['pk'], []),
+            }
+            record.update({name: row[name] for name in PROJECT_TAG_FIELDS})
+            yield record
+
+
+def export_snapshot(stream, chunk_size=2000, with_passwords=False, include=(PROFILE, PROJECT)):
+    """Write NDJSON records to ``stream``; returns the number of records written."""
+    written = 0
+    sources = []
+    if PROFILE in include:
+        sources.append(export_profiles(chunk_size, with_passwords))
+    if PROJECT in include:
+        sources.append(export_projects(chunk_size))
+    for source in sources:
+        for record in source:
+            stream.write(json.dumps(record, separators=(',', ':')))
+            stream.write('\n')
+            written += 1
+    return written
+
+
+def _string(record, name, required=False, default=''):
+    value = record.get(name, default)
+    if value is None and not required:
+        value = default
+    if not isinstance(value, str) or (required and not value):
+        raise RecordError(f'{name!r} must be a non-empty string' if required else f'{name!r} must be a string')
+    return value
+
+
+def _string_list(record, name):
+    value = record.get(name) or []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise RecordError(f'{name!r} must be a list of strings')
+    return value
+
+
+def _tags(record, names):
+    return {name: canonicalize_list(_string_list(record, name)) for name in names}
+
+
+def _datetime(record, name):
+    value = record.get(name)
+    if value is None:
+        return None
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise RecordError(f'{name!r} is not an ISO 8601 datetime')
+    return parsed
+
+
+def parse_profile(record):
+    hours = record.get('availability_hours', 10)
+    if not isinstance(hours, int) or isinstance(hours, bool):
+        raise RecordError("'availability_hours' must be an integer")
+    return {
+        'username': _string(record, 'username', required=True),
+        'email': _string(record, 'email'),
+        'password': record.get('password') if isinstance(record.get('password'), str) else None,
+        'bio': _string(record, 'bio'),
+        'availability_hours': hours,
+        'created_at': _datetime(record, 'created_at'),
+        **_tags(record, PROFILE_TAG_FIELDS),
+    }
+
+
+def parse_project(record):
+    project_id = record.get('id')
+    if not isinstance(project_id, int) or isinstance(project_id, bool) or project_id <= 0:
+        raise RecordError("'id' must be a positive integer")
+    return {
+        'id': project_id,
+        'title': _string(record, 'title', required=True),
+        'description': _string(record, 'description'),
+        'created_by': _string(record, 'created_by', required=True),
+        'created_at': _datetime(record, 'created_at'),
+        'members': _string_list(record, 'members'),
+        **_tags(record, PROJECT_TAG_FIELDS),
+    }
+
+
+PARSERS = {PROFILE: parse_profile, PROJECT: parse_project}
+
+
+def _save_profiles(rows):
+    """Upsert a batch of parsed profile records keyed by username."""
+    unusable = make_password(None)
+    User.objects.bulk_create(
+        [User(username=row['username'], email=row['email'], password=row['password'] or unusable) for row in rows],
+        update_conflicts=True, unique_fields=['username'], update_fields=['email'],
+    )
+    with_passwords = [row for row in rows if row['password']]
+    if with_passwords:
+        users = User.objects.in_bulk([row['username'] for row in with_passwords], field_name='username')
+        for row in with_passwords:
+            users[row['username']].password = row['password']
+        User.objects.bulk_update(users.values(), ['password'])
+
+    user_ids = dict(User.objects.filter(username__in=[row['username'] for row in rows]).values_list('username', 'pk'))
+    profiles = [
+        UserProfile(
+            user_id=user_ids[row['username']], bio=row['bio'], availability_hours=row['availability_hours'],
+            **{name: row[name] for name in PROFILE_TAG_FIELDS},
+        )
+        for row in rows
+    ]
+    UserProfile.objects.bulk_create(
+        profiles, update_conflicts=True, unique_fields=['user'],
+        update_fields=['bio', 'availability_hours', *PROFILE_TAG_FIELDS],
+    )
+    saved = UserProfile.objects.filter(user_id__in=user_ids.values())
+    _restore_created_at(saved, 'user__username', {row['username']: row['created_at'] for row in rows})
+    rebuild_profile_tags(saved, batch_size=len(rows))
+    profile_ids = list(saved.values_list('pk', flat=True))
+    recommendations.invalidate_profiles(profile_ids)
+    feed.invalidate_profiles(profile_ids)
+
+
+def _save_projects(rows):
+    """Upsert a batch of parsed project records keyed by id, replacing their memberships."""
+    usernames = {row['created_by'] for row in rows}
+    usernames.update(name for row in rows for name in row['members'])
+    profile_ids = dict(
+        UserProfile.objects.filter(user__username__in=usernames).values_list('user__username', 'pk')
+    )
+    missing = {row['created_by'] for row in rows} - profile_ids.keys()
+    if missing:
+        raise RecordError(f'unknown creator {sorted(missing)[0]!r}')
+
+    Project.objects.bulk_create(
+        [
+            Project(
+                id=row['id'], title=row['title'], description=row['description'],
+                created_by_id=profile_ids[row['created_by']],
+                **{name: row[name] for name in PROJECT_TAG_FIELDS},
+            )
+            for row in rows
+        ],
+        update_conflicts=True, unique_fields=['id'],
+        update_fields=['title', 'description', 'created_by', *PROJECT_TAG_FIELDS],
+    )
+    project_ids = [row['id'] for row in rows]
+    Membership = Project.members.through
+    Membership.objects.filter(project_id__in=project_ids).delete()
+    Membership.objects.bulk_create([
+        Membership(project_id=row['id'], userprofile_id=profile_ids[name])
+        for row in rows
+        for name in dict.fromkeys(row['members'])
+        if name in profile_ids
+    ], ignore_conflicts=True)
+
+    saved = Project.objects.filter(pk__in=project_ids)
+    _restore_created_at(saved, 'pk', {row['id']: row['created_at'] for row in rows})
+    # bulk writes skip post_save
+    projects_saved_in_bulk(saved)
+
+
+def _restore_created_at(queryset, key, timestamps):
+    # auto_now_add overwrites created_at on insert; bulk_update does not
+    objs = []
+    for pk, lookup, current in queryset.values_list('pk', key, 'created_at'):
+        value = timestamps.get(lookup)
+        if value is not None and current != value:
+            objs.append(queryset.model(pk=pk, created_at=value))
+    if objs:
+        queryset.model.objects.bulk_update(objs, ['created_at'])
+
+
+SAVERS = {PROFILE: _save_profiles, PROJECT: _save_projects}
+
+
+def _flush(kind, batch, result):
+    if not batch:
+        return
+    try:
+        with transaction.atomic():
+            SAVERS[kind]([row for _, row in batch])
+        setattr(result, kind + 's', getattr(result, kind + 's') + len(batch))
+        return
+    except (DatabaseError, RecordError):
+        if len(batch) == 1:
+            raise
+    # isolate the offending record(s) instead of dropping the whole batch
+    for line_number, row in batch:
+        try:
+            _flush(kind, [(line_number, row)], result)
+        except (DatabaseError, RecordError) as exc:
+            result.skip(line_number, str(exc))
+
+
+def import_snapshot(lines, batch_size=1000):
+    """
+    Upsert the NDJSON records read from ``lines`` and return an ``ImportResult``.
+
+    Malformed or unsaveable records are skipped and reported with their line
+    number; the rest of the snapshot is still imported.
+    """
+    result = ImportResult()
+    batches = {PROFILE: [], PROJECT: []}
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or record.get('type') not in PARSERS:
+                raise RecordError('unknown record type')
+            kind = record['type']
+            row = PARSERS[kind](record)
+        except (ValueError, RecordError) as exc:
+            result.skip(line_number, str(exc))
+            continue
+        if kind == PROJECT and batches[PROFILE]:
+            # projects may reference profiles that are still buffered
+            _flush(PROFILE, batches[PROFILE], result)
+            batches[PROFILE] = []
+        batches[kind].append((line_number, row))
+        if len(batches[kind]) >= batch_size:
+            _flush(kind, batches[kind], result)
+            batches[kind] = []
+    for kind in (PROFILE, PROJECT):
+        _flush(kind, batches[kind], result)
+    if result.projects:
+        # project ids are imported verbatim; move the sequence past them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Project]):
+                cursor.execute(sql)
+    return result
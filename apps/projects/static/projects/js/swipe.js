@@ -10,6 +10,11 @@ class SwipeCardManager {
         this.currentX = 0;
         this.currentY = 0;
         this.threshold = 100;
+        this.feedUrl = '/api/projects/api/feed/';
+        this.nextUrl = null;
+        this.loading = false;
+        // fetch the next page while this many cards are still left
+        this.prefetchAt = 3;
         
         this.init();
     }
@@ -22,7 +27,9 @@ class SwipeCardManager {
         this.showCurrentCard();
     }
 
-    async loadCards() {
+    async loadCards(url = this.feedUrl) {
+        const initial = url === this.feedUrl;
+        this.loading = true;
         try {
             // Check if user is authenticated
             const token = localStorage.getItem('access_token');
@@ -31,7 +38,7 @@ class SwipeCardManager {
                 return;
             }
             
-            const response = await fetch('/api/projects/api/', {
+            const response = await fetch(url, {
                 headers: {
                     'Authorization': `Bearer ${token}`,
                 }
@@ -42,26 +49,43 @@ class SwipeCardManager {
                 return;
             }
             
-            const projects = await response.json();
+            const data = await response.json();
+            this.nextUrl = data.next;
             
-            this.cards = projects.map(project => ({
+            const known = new Set(this.cards.map(card => card.id));
+            const cards = (data.results || []).filter(project => !known.has(project.id)).map(project => ({
                 id: project.id,
                 title: project.title,
                 description: project.description,
                 techStack: project.tech_stack || [],
                 neededRoles: project.needed_roles || [],
                 createdBy: project.created_by,
-                members: project.members || [],
+                memberCount: project.member_count,
                 createdAt: project.created_at
             }));
             
-            this.renderCards();
+            if (initial) {
+                this.cards = cards;
+                this.renderCards();
+            } else {
+                this.appendCards(cards);
+            }
         } catch (error) {
             console.error('Error loading projects:', error);
             this.showError('Failed to load projects');
+        } finally {
+            this.loading = false;
         }
     }
 
+    prefetch() {
+        if (this.loading || !this.nextUrl) return;
+        if (this.cards.length - this.currentCardIndex > this.prefetchAt) return;
+        const nextUrl = this.nextUrl;
+        this.nextUrl = null;
+        this.loadCards(nextUrl);
+    }
+
     renderCards() {
         this.container.innerHTML = '';
         
@@ -78,6 +102,22 @@ class SwipeCardManager {
         this.showCurrentCard();
     }
 
+    appendCards(cards) {
+        const offset = this.cards.length;
+        const waiting = this.currentCardIndex >= offset;
+        this.cards = this.cards.concat(cards);
+        cards.forEach((card, index) => {
+            this.container.appendChild(this.createCardElement(card, offset + index));
+        });
+        if (!waiting) return;
+        if (this.currentCardIndex >= this.cards.length) {
+            this.showEmptyState();
+            return;
+        }
+        this.showCurrentCard();
+        this.setupEventListeners();
+    }
+
     createCardElement(card, index) {
         const cardDiv = document.createElement('div');
         cardDiv.className = 'swipe-card';
@@ -107,7 +147,7 @@ class SwipeCardManager {
             <div class="card-footer">
                 <div class="card-meta">
                     <i class="fas fa-users"></i>
-                    ${card.members.length} members
+                    ${card.memberCount} members
                 </div>
                 <div class="card-meta">
                     <i class="fas fa-calendar"></i>
@@ -281,6 +321,8 @@ class SwipeCardManager {
         
         currentCard.classList.add('swipe-left');
         
+        this.recordSwipe(this.cards[this.currentCardIndex].id, 'pass');
+        
         setTimeout(() => {
             this.nextCard();
         }, 300);
@@ -292,34 +334,37 @@ class SwipeCardManager {
         
         currentCard.classList.add('swipe-right');
         
-        // Join the project
-        this.joinProject(this.cards[this.currentCardIndex].id);
+        // Liking a project joins it
+        this.recordSwipe(this.cards[this.currentCardIndex].id, 'like');
         
         setTimeout(() => {
             this.nextCard();
         }, 300);
     }
 
-    async joinProject(projectId) {
+    async recordSwipe(projectId, direction) {
         try {
             const token = localStorage.getItem('access_token');
-            const response = await fetch(`/api/projects/api/${projectId}/join/`, {
+            const response = await fetch(`${this.feedUrl}swipe/`, {
                 method: 'POST',
                 headers: {
                     'Authorization': `Bearer ${token}`,
                     'Content-Type': 'application/json',
-                }
+                },
+                body: JSON.stringify({ project: projectId, direction: direction })
             });
             
-            if (response.ok) {
+            if (!response.ok) {
+                this.showNotification('Failed to save swipe', 'error');
+            } else if (direction === 'like') {
                 const result = await response.json();
-                this.showNotification(result.message, 'success');
-            } else {
-                this.showNotification('Failed to join project', 'error');
+                if (result.joined) {
+                    this.showNotification('Joined project successfully', 'success');
+                }
             }
         } catch (error) {
-            console.error('Error joining project:', error);
-            this.showNotification('Failed to join project', 'error');
+            console.error('Error saving swipe:', error);
+            this.showNotification('Failed to save swipe', 'error');
         }
     }
 
@@ -332,6 +377,14 @@ class SwipeCardManager {
 
     nextCard() {
         this.currentCardIndex++;
+        this.prefetch();
+        if (this.currentCardIndex >= this.cards.length) {
+            // the prefetched page shows its first card when it arrives
+            if (!this.loading) {
+                this.showEmptyState();
+            }
+            return;
+        }
         this.showCurrentCard();
         this.setupEventListeners();
     }
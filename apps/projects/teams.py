@@ -0,0 +1,204 @@
+"""
+Team formation: fill a project's ``needed_roles`` from candidate profiles.
+
+Each needed role is filled by a different profile that lists it among its
+``preferred_roles``, and a profile can take on several roles only if its
+``availability_hours`` cover ``hours_per_role`` for each. Among those
+assignments the one with the highest total match score (see
+``projects.matching``) is chosen.
+
+Candidates are pruned in two steps: the indexed ProfileRole/ProfileSkill
+tables narrow each role to profiles that want it and have the hours, and
+only the ``pool_size`` best-matching of those per role enter the solver. The solver
+is an exact assignment (``scipy.optimize.linear_sum_assignment``) over role
+rows and profile "slot" columns, one slot per role a profile has hours for.
+
+A ``TeamBuilder`` memoises role pools and the pruned, scored candidate lists
+per (role, tech stack, roles), so ``build_many`` over every open project
+loads each role's pool once and reuses rankings for identical needs.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from django.db.models import Count
+
+from users.models import ProfileSkill, UserProfile
+from users.tags import normalize_tag
+from .matching import Vocabulary, build_matrix, profile_features, project_features, top_k_indices
+from .models import Project
+
+DEFAULT_HOURS_PER_ROLE = 5
+DEFAULT_POOL_SIZE = 50
+# with prefiltering, this many times pool_size candidates per role are scored exactly
+PREFILTER_FACTOR = 4
+# filling a role at all beats leaving it open, whatever the match score
+FILL_BONUS = 1.0
+FORBIDDEN = -1e9
+
+
+@dataclass
+class RoleAssignment:
+    role: str
+    profile_id: int = None
+    score: float = 0.0
+
+
+@dataclass
+class Team:
+    project_id: int
+    roles: list = field(default_factory=list)
+
+    @property
+    def score(self):
+        return sum(assignment.score for assignment in self.roles)
+
+    @property
+    def unfilled(self):
+        return [assignment.role for assignment in self.roles if assignment.profile_id is None]
+
+    @property
+    def profile_ids(self):
+        return sorted({assignment.profile_id for assignment in self.roles if assignment.profile_id is not None})
+
+
+class RolePool:
+    """
+    Profiles wanting one role: ids, hours and an L2-normalised feature
+    matrix, so scoring the pool against a project is one sparse product.
+    """
+
+    def __init__(self, rows):
+        self.ids = np.asarray([row['id'] for row in rows], dtype=np.int64)
+        self.hours = np.asarray([row['availability_hours'] for row in rows], dtype=np.int64)
+        self.vocabulary = Vocabulary()
+        self.matrix = build_matrix((profile_features(row) for row in rows), self.vocabulary, grow=True)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, project):
+        project_row = build_matrix([project_features(project)], self.vocabulary)
+        return self.matrix.dot(project_row.T).toarray().ravel()
+
+
+class TeamBuilder:
+    """
+    Builds teams, memoising what projects can share.
+
+    With ``prefilter`` (one-off requests) each role's candidates are first
+    narrowed in SQL to the profiles sharing the most skills with the project.
+    Without it (batch mode) every profile wanting a role is loaded once and
+    reused for every project.
+    """
+
+    def __init__(self, hours_per_role=DEFAULT_HOURS_PER_ROLE, pool_size=DEFAULT_POOL_SIZE, prefilter=False):
+        self.hours_per_role = max(int(hours_per_role), 1)
+        self.pool_size = pool_size
+        self.prefilter = prefilter
+        self._pools = {}
+        self._ranked = {}
+
+    def candidates(self, role):
+        return (
+            UserProfile.objects.with_role(role)
+            .filter(availability_hours__gte=self.hours_per_role)
+        )
+
+    def load_pool(self, queryset):
+        return RolePool(list(
+            queryset.order_by('pk').values('id', 'skills', 'interests', 'preferred_roles', 'availability_hours')
+        ))
+
+    def pool(self, role, project):
+        if not self.prefilter:
+            key = normalize_tag(role)
+            if key not in self._pools:
+                self._pools[key] = self.load_pool(self.candidates(role))
+            return self._pools[key]
+
+        limit = self.pool_size * PREFILTER_FACTOR
+        candidates = self.candidates(role)
+        skills = [normalize_tag(tech) for tech in project.tech_stack or []]
+        ids = list(
+            ProfileSkill.objects.filter(profile__in=candidates, skill__normalized__in=skills)
+            .values('profile_id').annotate(shared=Count('id'))
+            .order_by('-shared', 'profile_id').values_list('profile_id', flat=True)[:limit]
+        )
+        if len(ids) < limit:
+            # not enough skill overlap: anyone wanting the role can still fill it
+            ids += candidates.exclude(pk__in=ids).order_by('pk').values_list('pk', flat=True)[:limit - len(ids)]
+        return self.load_pool(UserProfile.objects.filter(pk__in=ids))
+
+    def ranked(self, role, project):
+        """``[(profile_id, score, hours), ...]`` best first, for ``role`` on ``project``."""
+        stack = tuple(sorted(normalize_tag(tech) for tech in project.tech_stack or []))
+        roles = tuple(sorted(normalize_tag(name) for name in project.needed_roles or []))
+        key = (normalize_tag(role), stack, roles)
+        if key not in self._ranked:
+            pool = self.pool(role, project)
+            if not len(pool):
+                self._ranked[key] = []
+            else:
+                scores = pool.scores(project)
+                # keep some slack so excluding a project's members still leaves pool_size candidates
+                best = top_k_indices(scores, self.pool_size * 2)
+                self._ranked[key] = [
+                    (int(pool.ids[i]), float(scores[i]), int(pool.hours[i])) for i in best
+                ]
+        return self._ranked[key]
+
+    def build(self, project, exclude=()):
+        """The best ``Team`` for ``project``; profiles in ``exclude`` are never picked."""
+        exclude = set(exclude)
+        roles = list(project.needed_roles or [])
+        team = Team(project_id=project.pk, roles=[RoleAssignment(role) for role in roles])
+        if not roles:
+            return team
+
+        candidates = {}
+        allowed = []
+        for role in roles:
+            ranked = [entry for entry in self.ranked(role, project) if entry[0] not in exclude][:self.pool_size]
+            allowed.append({pid: score for pid, score, _ in ranked})
+            for pid, score, hours in ranked:
+                candidates[pid] = hours
+
+        # one column per role a candidate has the hours for, plus one "leave open" column per role
+        columns = []
+        for pid, hours in candidates.items():
+            columns += [pid] * min(hours // self.hours_per_role, len(roles))
+        value = np.full((len(roles), len(columns) + len(roles)), FORBIDDEN)
+        for row, scores in enumerate(allowed):
+            for col, pid in enumerate(columns):
+                if pid in scores:
+                    value[row, col] = scores[pid] + FILL_BONUS
+            value[row, len(columns) + row] = 0.0
+
+        rows, cols = linear_sum_assignment(value, maximize=True)
+        for row, col in zip(rows, cols):
+            if col < len(columns) and value[row, col] > 0:
+                team.roles[row].profile_id = columns[col]
+                team.roles[row].score = value[row, col] - FILL_BONUS
+        return team
+
+    def build_many(self, projects, exclude_members=True):
+        for project in projects:
+            exclude = member_ids(project) if exclude_members else ()
+            yield self.build(project, exclude=exclude)
+
+
+def member_ids(project):
+    """Creator and current members: they are on the team already."""
+    return {project.created_by_id, *(member.pk for member in project.members.all())}
+
+
+def open_projects():
+    """Projects that still list needed roles, with members prefetched."""
+    return Project.objects.exclude(needed_roles=[]).prefetch_related('members').order_by('pk')
+
+
+def build_team(project, hours_per_role=DEFAULT_HOURS_PER_ROLE, pool_size=DEFAULT_POOL_SIZE, exclude_members=True):
+    builder = TeamBuilder(hours_per_role=hours_per_role, pool_size=pool_size, prefilter=True)
+    return next(builder.build_many([project], exclude_members=exclude_members))
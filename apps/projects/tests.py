@@ -1,3 +1,834 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import UserProfile
+from .models import FeedQueue, Project, ProjectBucket, ProjectSkill, ProfileRecommendations, SwipeEvent
+from .teams import build_team
+from .recommendations import get_recommendations
+from .search import TokenIndexSearchBackend, search_projects
+from .similarity import similar_project_ids
+from . import cache as project_cache, feed
+from .index import candidate_project_ids, candidates_for_profile, rebuild_index
+from .management.commands.create_demo_data import ROLES
+from .matching import MatchEngine, calculate_match_score, top_k_indices
+
+User = get_user_model()
+
+
+def make_profile(username, **fields):
+    user = User.objects.create_user(username=username, password='pass12345')
+    return UserProfile.objects.create(user=user, **fields)
+
+
+class MatchingTests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner')
+        self.backend = Project.objects.create(
+            title='API', description='', tech_stack=['Python', 'Django'],
+            needed_roles=['Backend Developer'], created_by=self.owner,
+        )
+        self.frontend = Project.objects.create(
+            title='SPA', description='', tech_stack=['React', 'CSS'],
+            needed_roles=['Frontend Developer'], created_by=self.owner,
+        )
+        self.mobile = Project.objects.create(
+            title='App', description='', tech_stack=['Flutter'],
+            needed_roles=['Mobile Developer'], created_by=self.owner,
+        )
+        self.profile = make_profile(
+            'alice', skills=['python', ' Django '], interests=['React'],
+            preferred_roles=['Backend Developer'],
+        )
+
+    def test_calculate_match_score(self):
+        self.assertAlmostEqual(calculate_match_score(self.profile, self.backend), 3 / np.sqrt(3 * 3.25))
+        self.assertEqual(calculate_match_score(self.profile, self.mobile), 0.0)
+        self.assertEqual(calculate_match_score({}, self.backend), 0.0)
+
+    def test_top_k_orders_and_skips_non_matching(self):
+        engine = MatchEngine.from_queryset()
+        ranked = engine.top_k(self.profile, k=10)
+        self.assertEqual([pid for pid, _ in ranked], [self.backend.pk, self.frontend.pk])
+        self.assertEqual(engine.top_k(self.profile, k=1)[0][0], self.backend.pk)
+        self.assertEqual(engine.top_k(self.profile, exclude={self.backend.pk})[0][0], self.frontend.pk)
+
+    def test_many_profiles_in_one_product(self):
+        designer = make_profile('bob', skills=['Flutter'], preferred_roles=['Mobile Developer'])
+        engine = MatchEngine.from_queryset()
+        scores = engine.score_matrix([self.profile, designer]).toarray()
+        self.assertEqual(scores.shape, (2, 3))
+        results = engine.top_k_many([self.profile, designer], k=1)
+        self.assertEqual(results[1][0][0], self.mobile.pk)
+        self.assertAlmostEqual(results[1][0][1], 1.0)
+
+    def test_top_k_indices(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7])
+        self.assertEqual(top_k_indices(scores, 2).tolist(), [1, 3])
+        self.assertEqual(top_k_indices(scores, 10).tolist(), [1, 3, 2, 0])
+
+
+class ProjectIndexTests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner')
+        self.project = Project.objects.create(
+            title='API', description='', tech_stack=['Python', 'Django'],
+            needed_roles=['Backend Developer'], created_by=self.owner,
+        )
+        self.other = Project.objects.create(
+            title='SPA', description='', tech_stack=['React', 'Python'],
+            needed_roles=[], created_by=self.owner,
+        )
+
+    def test_save_keeps_index_in_sync(self):
+        self.assertEqual(
+            set(self.project.project_skills.values_list('skill__normalized', flat=True)), {'python', 'django'},
+        )
+        self.assertEqual(
+            list(self.project.project_roles.values_list('role__name', flat=True)), ['Backend Developer'],
+        )
+        self.project.tech_stack = ['Go']
+        self.project.save()
+        self.assertEqual(candidate_project_ids(['skill:django']), [])
+        self.assertEqual(candidate_project_ids(['skill:go']), [self.project.pk])
+        self.project.delete()
+        self.assertFalse(ProjectSkill.objects.filter(skill__normalized='go').exists())
+
+    def test_indexed_filters(self):
+        self.assertEqual(list(Project.objects.with_skill(' PYTHON ').order_by('pk')), [self.project, self.other])
+        self.assertEqual(list(Project.objects.with_role('backend developer')), [self.project])
+        response = APIClient().get('/api/projects/api/?skill=react')
+        self.assertEqual([p['id'] for p in response.data['results']], [self.other.pk])
+
+    def test_candidates_ranked_by_shared_tokens(self):
+        profile = make_profile('alice', skills=['Python', 'Django'])
+        self.assertEqual(candidates_for_profile(profile), [self.project.pk, self.other.pk])
+        self.assertEqual(candidates_for_profile(profile, limit=1), [self.project.pk])
+
+    def test_rebuild_index(self):
+        ProjectSkill.objects.all().delete()
+        self.assertEqual(rebuild_index(batch_size=1), 2)
+        self.assertEqual(candidate_project_ids(['skill:react']), [self.other.pk])
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner')
+        self.backend = Project.objects.create(
+            title='API', description='', tech_stack=['Python', 'Django'],
+            needed_roles=['Backend Developer'], created_by=self.owner,
+        )
+        self.frontend = Project.objects.create(
+            title='SPA', description='', tech_stack=['React'],
+            needed_roles=['Frontend Developer'], created_by=self.owner,
+        )
+        self.profile = make_profile('alice', skills=['Python', 'React'], preferred_roles=['Backend Developer'])
+
+    def entry(self):
+        return ProfileRecommendations.objects.get(profile=self.profile)
+
+    def test_recommendations_are_cached(self):
+        ranked = get_recommendations(self.profile)
+        self.assertEqual([pid for pid, _ in ranked], [self.backend.pk, self.frontend.pk])
+        with self.assertNumQueries(1):
+            get_recommendations(self.profile)
+
+    def test_membership_change_invalidates(self):
+        get_recommendations(self.profile)
+        self.backend.members.add(self.profile)
+        self.assertTrue(self.entry().is_stale)
+        self.assertEqual([pid for pid, _ in get_recommendations(self.profile)], [self.frontend.pk])
+
+    def test_profile_change_invalidates_only_that_profile(self):
+        other = make_profile('bob', skills=['React'])
+        get_recommendations(self.profile)
+        get_recommendations(other)
+        self.profile.bio = 'unrelated'
+        self.profile.save()
+        self.assertFalse(self.entry().is_stale)
+        self.profile.skills = ['Django']
+        self.profile.save()
+        self.assertTrue(self.entry().is_stale)
+        self.assertFalse(ProfileRecommendations.objects.get(profile=other).is_stale)
+
+    def test_project_change_invalidates_affected_lists(self):
+        get_recommendations(self.profile)
+        Project.objects.create(
+            title='Unrelated', description='', tech_stack=['Flutter'], needed_roles=[], created_by=self.owner,
+        )
+        self.assertFalse(self.entry().is_stale)
+        Project.objects.create(
+            title='Python app', description='', tech_stack=['Python'], needed_roles=[], created_by=self.owner,
+        )
+        self.assertTrue(self.entry().is_stale)
+
+    def test_retag_and_delete_invalidate_through_tag_index(self):
+        other = make_profile('bob', skills=['Flutter'])
+        get_recommendations(self.profile)
+        get_recommendations(other)
+        # moving away from alice's tags still reaches her list, which holds the project
+        self.backend.tech_stack = ['Go']
+        self.backend.needed_roles = []
+        self.backend.save()
+        self.assertTrue(self.entry().is_stale)
+        self.assertFalse(ProfileRecommendations.objects.get(profile=other).is_stale)
+        get_recommendations(self.profile)
+        self.frontend.delete()
+        self.assertTrue(self.entry().is_stale)
+        self.assertFalse(ProfileRecommendations.objects.get(profile=other).is_stale)
+
+    def test_size_limit(self):
+        with self.settings(PROJECT_RECOMMENDATIONS={'MAX_PROFILES': 1}):
+            get_recommendations(self.profile)
+            get_recommendations(self.owner)
+            self.assertEqual(ProfileRecommendations.objects.count(), 1)
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(self.profile.user)
+        response = client.get('/api/projects/api/recommended/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['id'] for p in response.data], [self.backend.pk, self.frontend.pk])
+        self.assertGreater(response.data[0]['match_score'], response.data[1]['match_score'])
+
+
+class ListQueryCountTests(TestCase):
+    def setUp(self):
+        self.profile = make_profile('alice')
+        self.others = [make_profile(f'member{i}') for i in range(3)]
+
+    def add_projects(self, count):
+        for i in range(count):
+            project = Project.objects.create(
+                title=f'Project {i}', description='', tech_stack=['Python'],
+                needed_roles=[], created_by=self.others[i % 3],
+            )
+            project.members.add(self.profile, *self.others)
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, client, url):
+        self.add_projects(2)
+        small = self.count_queries(client, url)
+        self.add_projects(8)
+        self.assertEqual(self.count_queries(client, url), small)
+
+    def test_project_list_api(self):
+        self.assertConstantQueries(APIClient(), '/api/projects/api/')
+
+    def test_project_list_page_has_no_queries(self):
+        # the page is a shell; its projects come from the APIs
+        self.add_projects(2)
+        self.assertEqual(self.count_queries(self.client, '/'), 0)
+
+    def test_my_projects_api(self):
+        client = APIClient()
+        client.force_authenticate(self.profile.user)
+        self.assertConstantQueries(client, '/api/projects/api/my/')
+
+    def test_my_projects_view(self):
+        self.client.force_login(self.profile.user)
+        self.assertConstantQueries(self.client, '/my/')
+
+    def test_member_count_annotation(self):
+        self.add_projects(1)
+        response = APIClient().get('/api/projects/api/')
+        self.assertEqual(response.data['results'][0]['member_count'], 4)
+
+
+class ProjectPaginationTests(TestCase):
+    def setUp(self):
+        owner = make_profile('owner')
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', description='long text', created_by=owner)
+            for i in range(5)
+        ]
+
+    def test_cursor_pages_cover_all_rows_newest_first(self):
+        client = APIClient()
+        url = '/api/projects/api/?page_size=2'
+        seen = []
+        while url:
+            response = client.get(url)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen += [p['id'] for p in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [p.pk for p in reversed(self.projects)])
+
+    def test_sparse_fieldset(self):
+        response = APIClient().get('/api/projects/api/?fields=id,title')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+
+class MembershipTests(TestCase):
+    def setUp(self):
+        owner = make_profile('owner')
+        self.profile = make_profile('alice')
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', description='', created_by=owner)
+            for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.profile.user)
+
+    def test_join_toggle(self):
+        project = self.projects[0]
+        response = self.client.post(f'/api/projects/api/{project.pk}/join/')
+        self.assertEqual(response.data['message'], 'Joined project successfully')
+        self.assertTrue(project.has_member(self.profile))
+        response = self.client.post(f'/api/projects/api/{project.pk}/join/')
+        self.assertEqual(response.data['message'], 'Left project successfully')
+        self.assertFalse(project.has_member(self.profile))
+
+    def test_has_member_uses_prefetch(self):
+        self.projects[0].members.add(self.profile)
+        project = Project.objects.for_detail().get(pk=self.projects[0].pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(project.has_member(self.profile))
+
+    def test_bulk_membership(self):
+        first, second, third = self.projects
+        third.members.add(self.profile)
+        response = self.client.post('/api/projects/api/membership/', {
+            'join': [first.pk, second.pk, 999], 'leave': [third.pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['not_found'], [999])
+        self.assertEqual(
+            set(self.profile.projects_joined.values_list('pk', flat=True)), {first.pk, second.pk},
+        )
+
+    def test_bulk_membership_skips_own_projects(self):
+        own = Project.objects.create(title='Mine', description='', created_by=self.profile)
+        first = self.projects[0]
+        response = self.client.post(
+            '/api/projects/api/membership/', {'join': [own.pk, first.pk]}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['joined'], [first.pk])
+        self.assertEqual(response.data['own'], [own.pk])
+        self.assertFalse(own.has_member(self.profile))
+
+    def test_bulk_membership_rejects_conflicts(self):
+        pk = self.projects[0].pk
+        response = self.client.post('/api/projects/api/membership/', {'join': [pk], 'leave': [pk]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        owner = make_profile('owner')
+        self.chat = Project.objects.create(
+            title='Realtime chat', description='Messaging with websockets',
+            tech_stack=['Django', 'Redis'], needed_roles=['Backend Developer'], created_by=owner,
+        )
+        self.shop = Project.objects.create(
+            title='Online shop', description='A Django storefront with a chat widget',
+            tech_stack=['React'], needed_roles=['Frontend Developer'], created_by=owner,
+        )
+
+    def test_ranked_by_relevance(self):
+        self.assertEqual([pid for pid, _ in search_projects('chat')], [self.chat.pk, self.shop.pk])
+        self.assertEqual([pid for pid, _ in search_projects('redis')], [self.chat.pk])
+        self.assertEqual([pid for pid, _ in search_projects('front')], [self.shop.pk])
+        self.assertEqual(search_projects('"'), [])
+
+    def test_index_follows_save_and_delete(self):
+        self.chat.title = 'Video calls'
+        self.chat.description = ''
+        self.chat.save()
+        self.assertEqual([pid for pid, _ in search_projects('chat')], [self.shop.pk])
+        self.shop.delete()
+        self.assertEqual(search_projects('chat'), [])
+
+    def test_token_index_fallback(self):
+        results = TokenIndexSearchBackend().search('backend developer redis')
+        self.assertEqual([pid for pid, _ in results], [self.chat.pk])
+
+    def test_api_and_view(self):
+        response = APIClient().get('/api/projects/api/search/?q=django')
+        self.assertEqual({p['id'] for p in response.data}, {self.chat.pk, self.shop.pk})
+        response = self.client.get('/search/?q=websockets')
+        self.assertEqual(list(response.context['projects']), [self.chat])
+
+    def test_api_limit_is_clamped(self):
+        client = APIClient()
+        self.assertEqual(len(client.get('/api/projects/api/search/?q=chat&limit=-1').data), 1)
+        self.assertEqual(len(client.get('/api/projects/api/search/?q=chat&limit=0').data), 1)
+        self.assertEqual(client.get('/api/projects/api/search/?q=chat&limit=x').status_code, 400)
+
+
+class ProjectCacheTests(TestCase):
+    def setUp(self):
+        project_cache.get_cache().clear()
+        project_cache.stats.reset()
+        self.owner = make_profile('owner')
+        self.project = Project.objects.create(title='Cached', description='', created_by=self.owner)
+        self.client = APIClient()
+
+    def test_list_served_from_cache_until_write(self):
+        self.client.get('/api/projects/api/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/projects/api/')
+        self.assertEqual(response.data['results'][0]['title'], 'Cached')
+        self.assertEqual(project_cache.stats.as_dict()['hits'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Renamed'
+            self.project.save()
+        response = self.client.get('/api/projects/api/')
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+
+    def test_versions_bumped_on_commit(self):
+        version = project_cache.object_version(self.project.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.project.members.add(self.owner)
+                # a reader inside the window still addresses the old version
+                self.assertEqual(project_cache.object_version(self.project.pk), version)
+        self.assertNotEqual(project_cache.object_version(self.project.pk), version)
+
+    def test_detail_invalidated_by_membership_change(self):
+        url = f'/api/projects/api/{self.project.pk}/'
+        self.assertEqual(self.client.get(url).data['members'], [])
+        member = make_profile('alice')
+        with self.captureOnCommitCallbacks(execute=True):
+            member.projects_joined.add(self.project)
+        self.assertEqual(self.client.get(url).data['members'], [member.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.members.clear()
+        self.assertEqual(self.client.get(url).data['members'], [])
+
+    def test_detail_page_cached(self):
+        url = f'/{self.project.pk}/'
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['project'], self.project)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_member_fragment_follows_membership(self):
+        url = f'/{self.project.pk}/'
+        self.assertContains(self.client.get(url), 'No members yet')
+        key = make_template_fragment_key(
+            'project_members', [self.project.pk, project_cache.object_version(self.project.pk)],
+        )
+        self.assertIsNotNone(project_cache.get_cache().get(key))
+        with self.captureOnCommitCallbacks(execute=True):
+            make_profile('alice').projects_joined.add(self.project)
+        response = self.client.get(url)
+        self.assertContains(response, 'alice')
+        self.assertNotContains(response, 'No members yet')
+
+    def test_fragments_follow_username_changes(self):
+        member = make_profile('alice')
+        with self.captureOnCommitCallbacks(execute=True):
+            member.projects_joined.add(self.project)
+        url = f'/{self.project.pk}/'
+        self.assertContains(self.client.get(url), 'Created by owner')
+        for user, username in ((self.owner.user, 'olivia'), (member.user, 'alicia')):
+            with self.captureOnCommitCallbacks(execute=True):
+                user.username = username
+                user.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Created by olivia')
+        self.assertContains(response, 'alicia')
+
+    def test_cards_rendered_once_per_version(self):
+        self.client.force_login(self.owner.user)
+        self.assertContains(self.client.get('/my/'), 'Creator')
+        key = make_template_fragment_key(
+            'project_card', [self.project.pk, project_cache.object_version(self.project.pk), True],
+        )
+        self.assertIn('Cached', project_cache.get_cache().get(key))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Renamed'
+            self.project.save()
+        self.assertContains(self.client.get('/my/'), 'Renamed')
+
+
+class SeedCommandTests(TestCase):
+    def seed(self, **options):
+        call_command('create_demo_data', stdout=StringIO(), **options)
+
+    def test_synthetic_seed_is_deterministic_and_idempotent(self):
+        self.seed(users=30, projects=20, seed=3, batch_size=7)
+        self.assertEqual(UserProfile.objects.count(), 30)
+        self.assertEqual(Project.objects.count(), 20)
+        snapshot = list(Project.objects.order_by('title').values_list('title', 'tech_stack'))
+        memberships = Project.members.through.objects.count()
+        self.assertGreaterEqual(memberships, 20)
+
+        self.seed(users=30, projects=20, seed=3, batch_size=7)
+        self.assertEqual(Project.objects.count(), 20)
+        self.assertEqual(Project.members.through.objects.count(), memberships)
+        self.assertEqual(list(Project.objects.order_by('title').values_list('title', 'tech_stack')), snapshot)
+
+    def test_seeded_projects_are_indexed(self):
+        fan = make_profile('fan', skills=['Python', 'React', 'Go', 'Docker', 'Figma'], preferred_roles=ROLES)
+        get_recommendations(fan)
+        self.seed(users=5, projects=5, seed=1)
+        project = Project.objects.first()
+        self.assertIn(project.pk, candidate_project_ids(['skill:' + project.tech_stack[0].lower()]))
+        self.assertIn(project.pk, [pid for pid, _ in search_projects(project.title.split()[0], limit=50)])
+        # bulk-created projects reach recommendation invalidation like saved ones
+        self.assertTrue(ProfileRecommendations.objects.get(profile=fan).is_stale)
+
+
+class CanonicalizeCommandTests(TestCase):
+    def test_backfill_rewrites_rows(self):
+        owner = make_profile('owner', skills=['python'])
+        project = Project.objects.create(
+            title='Legacy', description='', tech_stack=['ReactJS', 'react'], needed_roles=[], created_by=owner,
+        )
+        Project.objects.filter(pk=project.pk).update(tech_stack=['ReactJS', 'react', 'nodejs'])
+        fan = make_profile('fan', skills=['React'])
+        get_recommendations(fan)
+        feed.get_queue(fan)
+        version = project_cache.object_version(project.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('canonicalize_tags', batch_size=1, stdout=StringIO())
+        project.refresh_from_db()
+        owner.refresh_from_db()
+        self.assertEqual(project.tech_stack, ['React', 'Node.js'])
+        self.assertEqual(owner.skills, ['Python'])
+        self.assertEqual(list(Project.objects.with_skill('node')), [project])
+        self.assertNotEqual(project_cache.object_version(project.pk), version)
+        self.assertTrue(ProfileRecommendations.objects.get(profile=fan).is_stale)
+        self.assertTrue(FeedQueue.objects.get(profile=fan).is_stale)
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner', skills=['Python'], preferred_roles=['Backend Developer'])
+        self.member = make_profile('member', skills=['React'])
+        self.project = Project.objects.create(
+            title='Snapshot', description='d', tech_stack=['Django'], needed_roles=['Designer'], created_by=self.owner,
+        )
+        self.project.members.add(self.owner, self.member)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_round_trip_gzip(self):
+        path = os.path.join(self.tmpdir.name, 'snapshot.ndjson.gz')
+        call_command('export_snapshot', path, chunk_size=1, stderr=StringIO())
+        with gzip.open(path, 'rt') as stream:
+            records = [json.loads(line) for line in stream]
+        self.assertEqual([r['type'] for r in records], ['profile', 'profile', 'project'])
+        self.assertEqual(records[2]['members'], ['owner', 'member'])
+
+        created_at = self.project.created_at
+        Project.objects.all().delete()
+        UserProfile.objects.filter(pk=self.member.pk).delete()
+        User.objects.filter(username='member').delete()
+
+        call_command('import_snapshot', path, batch_size=1, stdout=StringIO())
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual(project.created_at, created_at)
+        self.assertEqual(
+            sorted(project.members.values_list('user__username', flat=True)), ['member', 'owner'],
+        )
+        self.assertEqual(list(Project.objects.with_skill('django')), [project])
+        self.assertEqual(UserProfile.objects.get(user__username='member').skills, ['React'])
+        self.assertFalse(User.objects.get(username='member').has_usable_password())
+
+    def test_upsert_invalidates_caches(self):
+        path = os.path.join(self.tmpdir.name, 'snapshot.ndjson')
+        call_command('export_snapshot', path, stderr=StringIO())
+        fan = make_profile('fan', skills=['Django'])
+        get_recommendations(fan)
+        version = project_cache.object_version(self.project.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_snapshot', path, stdout=StringIO())
+        self.assertNotEqual(project_cache.object_version(self.project.pk), version)
+        self.assertTrue(ProfileRecommendations.objects.get(profile=fan).is_stale)
+
+    def test_bad_lines_are_skipped(self):
+        path = os.path.join(self.tmpdir.name, 'snapshot.ndjson')
+        with open(path, 'w') as stream:
+            stream.write('{"type": "profile", "username": "dave", "skills": ["python"]}\n')
+            stream.write('not json\n')
+            stream.write('{"type": "project", "id": 900, "title": "Orphan", "created_by": "nobody"}\n')
+            stream.write('{"type": "project", "id": 901, "title": "Good", "created_by": "dave", "members": ["dave"]}\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_snapshot', path, stdout=out, stderr=err)
+        self.assertIn('Imported 1 profiles and 1 projects, skipped 2 records', out.getvalue())
+        self.assertIn('line 2', err.getvalue())
+        self.assertIn('line 3', err.getvalue())
+        self.assertEqual(Project.objects.get(pk=901).members.get().user.username, 'dave')
+        self.assertEqual(UserProfile.objects.get(user__username='dave').skills, ['Python'])
+
+
+class AsyncProjectAPITests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner', skills=['Python'])
+        self.projects = [
+            Project.objects.create(
+                title=f'Project {i}', description='d', tech_stack=['Python'], needed_roles=[], created_by=self.owner,
+            )
+            for i in range(3)
+        ]
+        self.member = make_profile('member', skills=['Python'])
+        self.projects[0].members.add(self.member)
+        self.client = AsyncClient()
+
+    async def test_list_matches_sync_pages(self):
+        response = await self.client.get('/api/projects/api/async/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        sync_first = (await self.client.get('/api/projects/api/', {'page_size': 2})).json()
+        self.assertEqual(first['results'], sync_first['results'])
+        second = (await self.client.get(first['next'])).json()
+        self.assertEqual([p['title'] for p in second['results']], ['Project 0'])
+        self.assertEqual(second['results'][0]['members'], [self.member.pk])
+
+    async def test_detail_and_missing(self):
+        response = await self.client.get(f'/api/projects/api/async/{self.projects[1].pk}/', {'fields': 'id,title'})
+        self.assertEqual(response.json(), {'id': self.projects[1].pk, 'title': 'Project 1'})
+        response = await self.client.get('/api/projects/api/async/999999/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_overview_requires_token(self):
+        response = await self.client.get('/api/projects/api/async/overview/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.client.get('/api/projects/api/async/my/', headers={'Authorization': 'Bearer nonsense'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'token_not_valid')
+
+        token = str(AccessToken.for_user(self.member.user))
+        response = await self.client.get('/api/projects/api/async/overview/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual([p['title'] for p in data['mine']], ['Project 0'])
+        self.assertEqual(len(data['latest']['results']), 3)
+        self.assertEqual({p['title'] for p in data['recommended']}, {'Project 1', 'Project 2'})
+
+
+class BatchProjectAPITests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner', skills=['Go'])
+        self.other = make_profile('other')
+        self.mine = Project.objects.create(
+            title='Mine', description='d', tech_stack=['Python'], needed_roles=[], created_by=self.owner,
+        )
+        self.theirs = Project.objects.create(
+            title='Theirs', description='d', tech_stack=[], needed_roles=[], created_by=self.other,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner.user)
+
+    def test_create_and_update_in_one_request(self):
+        response = self.client.post('/api/projects/api/batch/', {
+            'create': [
+                {'title': f'New {i}', 'description': 'd', 'tech_stack': ['golang'], 'needed_roles': []}
+                for i in range(3)
+            ],
+            'update': [{'id': self.mine.pk, 'tech_stack': ['reactjs']}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results], ['created'] * 3 + ['updated'])
+        created = Project.objects.filter(pk__in=[r['id'] for r in results[:3]])
+        self.assertEqual({p.created_by_id for p in created}, {self.owner.pk})
+        self.assertEqual(created[0].tech_stack, ['Go'])
+        self.assertEqual(set(Project.objects.with_skill('go')), set(created))
+        self.mine.refresh_from_db()
+        self.assertEqual(self.mine.tech_stack, ['React'])
+        self.assertEqual(self.mine.title, 'Mine')
+        self.assertEqual(list(Project.objects.with_skill('react')), [self.mine])
+
+    def test_invalid_item_rejects_whole_batch(self):
+        response = self.client.post('/api/projects/api/batch/', {
+            'create': [{'title': 'Fine', 'description': 'd'}, {'description': 'no title'}],
+            'update': [{'id': self.theirs.pk, 'title': 'Hijacked'}, {'id': 999999, 'title': 'x'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        statuses = [(r['op'], r['index'], r['status']) for r in response.data['results']]
+        self.assertEqual(statuses, [
+            ('create', 0, 'skipped'), ('create', 1, 'invalid'), ('update', 0, 'invalid'), ('update', 1, 'invalid'),
+        ])
+        self.assertIn('title', response.data['results'][1]['errors'])
+        self.assertFalse(Project.objects.filter(title__in=['Fine', 'Hijacked']).exists())
+
+
+class TeamFormationTests(TestCase):
+    def setUp(self):
+        self.owner = make_profile('owner')
+        self.project = Project.objects.create(
+            title='Team', description='d', tech_stack=['Python', 'Django', 'Figma'],
+            needed_roles=['Backend Developer', 'UI Designer'], created_by=self.owner,
+        )
+        self.ada = make_profile(
+            'ada', skills=['Python', 'Django', 'Figma'], preferred_roles=['Backend Developer', 'UI Designer'],
+            availability_hours=10,
+        )
+        self.bob = make_profile('bob', skills=['Python'], preferred_roles=['Backend Developer'], availability_hours=10)
+        self.cy = make_profile('cy', skills=['Go'], preferred_roles=['UI Designer'], availability_hours=2)
+
+    def test_hours_limit_roles_per_profile(self):
+        team = build_team(self.project, hours_per_role=10)
+        self.assertEqual({a.role: a.profile_id for a in team.roles}, {
+            'Backend Developer': self.bob.pk, 'UI Designer': self.ada.pk,
+        })
+        team = build_team(self.project, hours_per_role=5)
+        self.assertEqual(team.profile_ids, [self.ada.pk])
+        self.assertEqual(team.unfilled, [])
+
+    def test_unfillable_role_and_members_excluded(self):
+        self.project.members.add(self.ada)
+        team = build_team(self.project, hours_per_role=10)
+        self.assertEqual(team.unfilled, ['UI Designer'])
+        self.assertEqual(team.profile_ids, [self.bob.pk])
+
+    def test_api_and_batch(self):
+        client = APIClient()
+        client.force_authenticate(self.owner.user)
+        response = client.get(f'/api/projects/api/{self.project.pk}/team/?hours=10')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(r['role'], r['profile']['username']) for r in response.data['roles']],
+            [('Backend Developer', 'bob'), ('UI Designer', 'ada')],
+        )
+        out = StringIO()
+        call_command('suggest_teams', hours=10, stdout=out, stderr=StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['project'] for row in rows], [self.project.pk])
+
+
+class SimilarityTests(TestCase):
+    def setUp(self):
+        project_cache.get_cache().clear()
+        owner = make_profile('owner')
+        text = 'A realtime chat application with channels, presence indicators and message history for teams'
+        self.chat = Project.objects.create(
+            title='Chat', description=text, tech_stack=['Django', 'Redis', 'React'],
+            needed_roles=['Backend Developer'], created_by=owner,
+        )
+        self.clone = Project.objects.create(
+            title='Chat clone', description=text + ' and threads', tech_stack=['Django', 'Redis', 'React'],
+            needed_roles=['Backend Developer'], created_by=owner,
+        )
+        self.game = Project.objects.create(
+            title='Game', description='A 2D platformer written for the browser with level editor support',
+            tech_stack=['Phaser', 'TypeScript'], needed_roles=['Game Designer'], created_by=owner,
+        )
+
+    def test_near_duplicates_found(self):
+        similar = similar_project_ids(self.chat.pk)
+        self.assertEqual([pid for pid, _ in similar], [self.clone.pk])
+        self.assertGreater(similar[0][1], 0.5)
+        self.assertEqual(similar_project_ids(self.game.pk), [])
+
+    def test_signature_follows_save(self):
+        buckets = set(ProjectBucket.objects.filter(project=self.game).values_list('bucket', flat=True))
+        self.game.description = self.chat.description
+        self.game.tech_stack = self.chat.tech_stack
+        self.game.needed_roles = self.chat.needed_roles
+        self.game.save()
+        self.assertFalse(buckets & set(ProjectBucket.objects.filter(project=self.game).values_list('bucket', flat=True)))
+        self.assertIn(self.game.pk, [pid for pid, _ in similar_project_ids(self.chat.pk)])
+        self.clone.delete()
+        self.assertNotIn(self.clone.pk, [pid for pid, _ in similar_project_ids(self.chat.pk)])
+
+    def test_api_and_detail_page(self):
+        response = APIClient().get(f'/api/projects/api/{self.chat.pk}/similar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['id'] for p in response.data], [self.clone.pk])
+        self.assertGreater(response.data[0]['similarity'], 0.5)
+        self.assertEqual(APIClient().get('/api/projects/api/999999/similar/').status_code, 404)
+        response = self.client.get(f'/{self.chat.pk}/')
+        self.assertEqual(response.context['similar_projects'], [self.clone])
+        self.assertContains(response, 'Similar Projects')
+
+
+class SwipeFeedTests(TestCase):
+    def setUp(self):
+        owner = make_profile('owner')
+        self.profile = make_profile('dev', skills=['Django'], preferred_roles=['Backend Developer'])
+        self.best = Project.objects.create(
+            title='Best', description='d', tech_stack=['Django'], needed_roles=['Backend Developer'], created_by=owner,
+        )
+        self.good = Project.objects.create(
+            title='Good', description='d', tech_stack=['Django', 'Vue', 'Go'], needed_roles=['Designer'],
+            created_by=owner,
+        )
+        self.other = Project.objects.create(
+            title='Other', description='d', tech_stack=['Rust'], needed_roles=['Designer'], created_by=owner,
+        )
+        self.own = Project.objects.create(
+            title='Own', description='d', tech_stack=['Django'], needed_roles=['Backend Developer'],
+            created_by=self.profile,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.profile.user)
+
+    def feed(self, url='/api/projects/api/feed/?limit=2'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_follow_match_score_and_token(self):
+        first = self.feed()
+        self.assertEqual([p['id'] for p in first['results']], [self.best.pk, self.good.pk])
+        self.assertGreater(first['results'][0]['match_score'], first['results'][1]['match_score'])
+        second = self.feed(first['next'])
+        self.assertEqual([p['id'] for p in second['results']], [self.other.pk])
+        self.assertEqual(self.client.get('/api/projects/api/feed/?token=forged').status_code, 400)
+
+    def test_swipes_are_excluded_without_reranking(self):
+        first = self.feed()
+        response = self.client.post(
+            '/api/projects/api/feed/swipe/', {'project': self.other.pk, 'direction': 'pass'}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(
+            '/api/projects/api/feed/swipe/', {'project': self.best.pk, 'direction': 'like'}, format='json',
+        )
+        self.assertTrue(response.data['joined'])
+        self.assertTrue(self.best.has_member(self.profile))
+        self.assertEqual(SwipeEvent.objects.filter(profile=self.profile).count(), 2)
+        generation = FeedQueue.objects.get(profile=self.profile).generation
+        self.assertEqual(self.feed(first['next'])['results'], [])
+        self.assertEqual(FeedQueue.objects.get(profile=self.profile).generation, generation)
+        # a fresh feed skips what was swiped
+        self.assertEqual([p['id'] for p in self.feed()['results']], [self.good.pk])
+
+    def test_swipe_rules(self):
+        url = '/api/projects/api/feed/swipe/'
+        response = self.client.post(url, {'project': self.own.pk, 'direction': 'like'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.own.has_member(self.profile))
+        self.client.post(url, {'project': self.best.pk, 'direction': 'pass'}, format='json')
+        response = self.client.post(url, {'project': self.best.pk, 'direction': 'like'}, format='json')
+        self.assertTrue(response.data['joined'])
+        response = self.client.post(url, {'project': self.best.pk, 'direction': 'like'}, format='json')
+        self.assertFalse(response.data['joined'])
+        self.assertEqual(SwipeEvent.objects.get(profile=self.profile).direction, SwipeEvent.LIKE)
+
+    def test_profile_change_rebuilds_queue(self):
+        self.feed()
+        self.profile.skills = ['Rust']
+        self.profile.save()
+        self.assertTrue(FeedQueue.objects.get(profile=self.profile).is_stale)
+        self.assertEqual(self.feed()['results'][0]['id'], self.other.pk)
+        self.assertEqual(
+            self.client.post('/api/projects/api/feed/swipe/', {'project': 999999, 'direction': 'like'}).status_code,
+            404,
+        )
@@ -2,13 +2,30 @@ from django.urls import path
 from .views import (
 	ProjectCreateView,
 	ProjectListView,
+	ProjectSearchView,
 	ProjectDetailView,
 	MyProjectsView,
 	join_project,
 	ProjectListAPIView,
 	ProjectDetailAPIView,
 	MyProjectsAPIView,
+	RecommendedProjectsAPIView,
+	SimilarProjectsAPIView,
+	ProjectSearchAPIView,
 	join_project_api,
+	project_feed_api,
+	swipe_api,
+	bulk_membership_api,
+	batch_projects_api,
+	project_team_api,
+	project_cache_stats_api,
+)
+from .async_views import (
+	project_list_async,
+	project_detail_async,
+	my_projects_async,
+	recommended_projects_async,
+	project_overview_async,
 )
 
 app_name = 'projects'
@@ -17,18 +34,48 @@ urlpatterns = [
 	path('', ProjectListView.as_view(), name='project_list'),
 	path('create/', ProjectCreateView.as_view(), name='project_create'),
 	path('my/', MyProjectsView.as_view(), name='my_projects'),
+	path('search/', ProjectSearchView.as_view(), name='project_search'),
 	path('<int:pk>/', ProjectDetailView.as_view(), name='project_detail'),
 	path('<int:pk>/join/', join_project, name='project_join'),
 	# API endpoints
 	path('api/', ProjectListAPIView.as_view(), name='project_list_api'),
 	path('api/my/', MyProjectsAPIView.as_view(), name='my_projects_api'),
+	path('api/recommended/', RecommendedProjectsAPIView.as_view(), name='recommended_projects_api'),
+	path('api/feed/', project_feed_api, name='project_feed_api'),
+	path('api/feed/swipe/', swipe_api, name='project_swipe_api'),
+	path('api/search/', ProjectSearchAPIView.as_view(), name='project_search_api'),
 	path('api/<int:pk>/', ProjectDetailAPIView.as_view(), name='project_detail_api'),
 	path('api/<int:pk>/join/', join_project_api, name='project_join_api'),
+	path('api/<int:pk>/similar/', SimilarProjectsAPIView.as_view(), name='similar_projects_api'),
+	path('api/<int:pk>/team/', project_team_api, name='project_team_api'),
+	path('api/membership/', bulk_membership_api, name='bulk_membership_api'),
+	path('api/batch/', batch_projects_api, name='batch_projects_api'),
+	path('api/cache/stats/', project_cache_stats_api, name='project_cache_stats_api'),
+	# async (ASGI-native) read endpoints
+	path('api/async/', project_list_async, name='project_list_async'),
+	path('api/async/my/', my_projects_async, name='my_projects_async'),
+	path('api/async/recommended/', recommended_projects_async, name='recommended_projects_async'),
+	path('api/async/overview/', project_overview_async, name='project_overview_async'),
+	path('api/async/<int:pk>/', project_detail_async, name='project_detail_async'),
 ]
 
-# GET /api/projects/api/ - List all projects 
+# GET /api/projects/api/ - List all projects (?skill=, ?role= filters, ?fields=, cursor paging)
 # POST /api/projects/api/ - Create new project 
 # GET /api/projects/api/{id}/ - Get project details 
 # PUT /api/projects/api/{id}/ - Update project 
 # GET /api/projects/api/my/ - Get user's projects 
-# POST /api/projects/api/{id}/join/ - Join/leave project 
\ No newline at end of file
+# GET /api/projects/api/recommended/ - Get recommended projects for the user
+# GET /api/projects/api/feed/?token=&limit= - Next unseen projects for the swipe UI, best match first
+# POST /api/projects/api/feed/swipe/ - Record a swipe ({"project": id, "direction": "like"|"pass"}); likes join
+# GET /api/projects/api/search/?q= - Search projects, best match first
+# POST /api/projects/api/{id}/join/ - Join/leave project 
+# GET /api/projects/api/{id}/similar/?limit= - Projects with similar tech stack, roles and description
+# GET /api/projects/api/{id}/team/?hours=&pool= - Suggested profiles filling the project's needed roles
+# POST /api/projects/api/membership/ - Join/leave several projects at once
+# POST /api/projects/api/batch/ - Create and/or partially update many projects at once
+# GET /api/projects/api/cache/stats/ - Project cache hit/miss counters (staff only)
+# GET /api/projects/api/async/ - Async project list (same paging and filters as /api/)
+# GET /api/projects/api/async/{id}/ - Async project details
+# GET /api/projects/api/async/my/ - Async user's projects
+# GET /api/projects/api/async/recommended/ - Async recommended projects
+# GET /api/projects/api/async/overview/ - Latest page, user's projects and recommendations together
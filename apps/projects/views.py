@@ -3,16 +3,37 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.views.generic import CreateView, ListView, DetailView, TemplateView
 from django.urls import reverse_lazy
-from .models import Project
+from .models import OwnProject, Project
 from .forms import ProjectForm
-from .serializers import ProjectSerializer
+from .serializers import (
+	MembershipBulkSerializer,
+	ProjectBulkListSerializer,
+	ProjectSerializer,
+	RecommendedProjectSerializer,
+	SimilarProjectSerializer,
+	SwipeSerializer,
+	requested_fields,
+	serialize_team,
+)
+from .feed import InvalidToken, next_page, record_swipe
+from .pagination import ProjectCursorPagination
+from .recommendations import get_recommendations
+from .search import search_projects
+from .similarity import similar_project_ids
+from .teams import DEFAULT_HOURS_PER_ROLE, DEFAULT_POOL_SIZE, build_team
+from .signals import projects_saved_in_bulk
+from . import cache as project_cache
 from users.models import UserProfile
-from django.db.models import Q
+from core.routers import read_source
+from core.throttling import TokenBucketThrottle, throttle
+from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, status, serializers
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ProjectCreateView(LoginRequiredMixin, CreateView):
@@ -32,17 +53,36 @@ class ProjectCreateView(LoginRequiredMixin, CreateView):
 		return redirect('projects:project_detail', pk=instance.pk)
 
 
-class ProjectListView(ListView):
-	model = Project
+class ProjectListView(TemplateView):
+	# the swipe and grid views load their projects from the feed and list APIs
 	template_name = 'projects/project_list.html'
+
+
+class ProjectSearchView(ListView):
+	template_name = 'projects/project_search.html'
 	context_object_name = 'projects'
 
+	def get_queryset(self):
+		self.query = self.request.GET.get('q', '').strip()
+		ids = [pid for pid, _ in search_projects(self.query, limit=50)] if self.query else []
+		projects = Project.objects.for_listing().in_bulk(ids)
+		return project_cache.attach_versions(projects[pid] for pid in ids if pid in projects)
+
+	def get_context_data(self, **kwargs):
+		ctx = super().get_context_data(**kwargs)
+		ctx['query'] = self.query
+		return ctx
+
 
 class ProjectDetailView(DetailView):
-	model = Project
+	queryset = Project.objects.for_detail()
 	template_name = 'projects/project_detail.html'
 	context_object_name = 'project'
 
+	def get_object(self, queryset=None):
+		key = project_cache.object_key('page', self.kwargs['pk'])
+		return project_cache.get_or_build(key, lambda: super(ProjectDetailView, self).get_object(queryset))
+
 	def get_context_data(self, **kwargs):
 		ctx = super().get_context_data(**kwargs)
 		user = self.request.user
@@ -50,13 +90,26 @@ class ProjectDetailView(DetailView):
 		if user.is_authenticated:
 			try:
 				profile = user.userprofile
-				is_member = profile in self.object.members.all()
+				is_member = self.object.has_member(profile)
 			except Exception:
 				is_member = False
 		ctx['is_member'] = is_member
+		ctx['similar_projects'] = similar_projects(self.object.pk, limit=5)
+		self.object.cache_version = project_cache.object_version(self.object.pk)
 		return ctx
 
 
+def cached_similar(pk, limit):
+	key = project_cache.list_key('similar', f'{pk}:{limit}')
+	return project_cache.get_or_build(key, lambda: similar_project_ids(pk, limit=limit))
+
+
+def similar_projects(pk, limit=10):
+	similar = cached_similar(pk, limit)
+	projects = Project.objects.for_listing().in_bulk([pid for pid, _ in similar])
+	return [projects[pid] for pid, _ in similar if pid in projects]
+
+
 class MyProjectsView(LoginRequiredMixin, ListView):
 	model = Project
 	template_name = 'projects/my_projects.html'
@@ -67,10 +120,20 @@ class MyProjectsView(LoginRequiredMixin, ListView):
 			profile = self.request.user.userprofile
 		except Exception:
 			return Project.objects.none()
-		return Project.objects.filter(Q(created_by=profile) | Q(members=profile)).distinct()
+		return Project.objects.for_profile(profile).for_listing()
+
+	def get_context_data(self, **kwargs):
+		ctx = super().get_context_data(**kwargs)
+		projects = project_cache.attach_versions(ctx['projects'])
+		for project in projects:
+			project.is_creator = project.created_by.user_id == self.request.user.pk
+		ctx['projects'] = ctx['object_list'] = projects
+		return ctx
 
 
 @login_required
+@require_POST
+@throttle('join')
 def join_project(request, pk):
 	project = get_object_or_404(Project, pk=pk)
 	try:
@@ -78,18 +141,36 @@ def join_project(request, pk):
 	except Exception:
 		return redirect('projects:project_detail', pk=pk)
 
-	if profile in project.members.all():
-		project.members.remove(profile)
-	else:
-		project.members.add(profile)
+	project.toggle_member(profile)
 	return redirect('projects:project_detail', pk=pk)
 
 
 # API Views
+def listing_queryset(request):
+    queryset = Project.objects.for_listing(fields=requested_fields(request))
+    skill = request.GET.get('skill')
+    if skill:
+        queryset = queryset.with_skill(skill)
+    role = request.GET.get('role')
+    if role:
+        queryset = queryset.with_role(role)
+    return queryset
+
 class ProjectListAPIView(generics.ListCreateAPIView):
-    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ProjectCursorPagination
+    replica_reads = True
+
+    def get_queryset(self):
+        return listing_queryset(self.request)
+
+    def list(self, request, *args, **kwargs):
+        key = project_cache.list_key('api', f'{read_source()}:{request.get_host()}?{request.GET.urlencode()}')
+        data = project_cache.get_or_build(
+            key, lambda: super(ProjectListAPIView, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
 
     def perform_create(self, serializer):
         try:
@@ -100,25 +181,103 @@ class ProjectListAPIView(generics.ListCreateAPIView):
 
 
 class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    replica_reads = True
+
+    def get_queryset(self):
+        return Project.objects.for_listing(fields=requested_fields(self.request))
+
+    def retrieve(self, request, *args, **kwargs):
+        key = project_cache.object_key('api', kwargs['pk'], f'{read_source()}:{request.GET.urlencode()}')
+        data = project_cache.get_or_build(
+            key, lambda: super(ProjectDetailAPIView, self).retrieve(request, *args, **kwargs).data
+        )
+        return Response(data)
 
 
 class MyProjectsAPIView(generics.ListAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get_queryset(self):
         try:
             profile = self.request.user.userprofile
-            return Project.objects.filter(Q(created_by=profile) | Q(members=profile)).distinct()
+            return Project.objects.for_profile(profile).for_listing()
         except Exception:
             return Project.objects.none()
 
 
+class RecommendedProjectsAPIView(generics.ListAPIView):
+    serializer_class = RecommendedProjectSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_recommendations(self):
+        if not hasattr(self, '_recommendations'):
+            try:
+                profile = self.request.user.userprofile
+                self._recommendations = get_recommendations(profile)
+            except Exception:
+                self._recommendations = []
+        return self._recommendations
+
+    def get_queryset(self):
+        ids = [pid for pid, _ in self.get_recommendations()]
+        projects = Project.objects.for_listing().in_bulk(ids)
+        return [projects[pid] for pid in ids if pid in projects]
+
+    def get_serializer_context(self):
+        ctx = super().get_serializer_context()
+        ctx['scores'] = dict(self.get_recommendations())
+        return ctx
+
+
+class SimilarProjectsAPIView(generics.ListAPIView):
+    serializer_class = SimilarProjectSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_similar(self):
+        if not hasattr(self, '_similar'):
+            get_object_or_404(Project.objects.only('pk'), pk=self.kwargs['pk'])
+            try:
+                limit = min(max(int(self.request.query_params.get('limit', 10)), 1), 50)
+            except ValueError:
+                limit = 10
+            self._similar = cached_similar(self.kwargs['pk'], limit)
+        return self._similar
+
+    def get_queryset(self):
+        ids = [pid for pid, _ in self.get_similar()]
+        projects = Project.objects.for_listing(fields=requested_fields(self.request)).in_bulk(ids)
+        return [projects[pid] for pid in ids if pid in projects]
+
+    def get_serializer_context(self):
+        ctx = super().get_serializer_context()
+        ctx['similarity'] = dict(self.get_similar())
+        return ctx
+
+
+class ProjectSearchAPIView(generics.ListAPIView):
+    serializer_class = ProjectSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            return []
+        try:
+            limit = min(max(int(self.request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            raise serializers.ValidationError({"error": "limit must be an integer"})
+        ids = [pid for pid, _ in search_projects(query, limit=limit)]
+        projects = Project.objects.for_listing(fields=requested_fields(self.request)).in_bulk(ids)
+        return [projects[pid] for pid in ids if pid in projects]
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@throttle_classes([TokenBucketThrottle.scoped('join')])
 def join_project_api(request, pk):
     project = get_object_or_404(Project, pk=pk)
     try:
@@ -126,10 +285,171 @@ def join_project_api(request, pk):
     except Exception:
         return Response({"error": "User profile not found"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if profile in project.members.all():
-        project.members.remove(profile)
-        return Response({"message": "Left project successfully"})
-    else:
-        project.members.add(profile)
+    if project.toggle_member(profile):
         return Response({"message": "Joined project successfully"})
+    return Response({"message": "Left project successfully"})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def project_feed_api(request):
+    """The next unseen projects for the swipe UI; follow ``next`` for more."""
+    try:
+        profile = request.user.userprofile
+    except Exception:
+        return Response({"error": "User profile not found"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.query_params['limit']) if 'limit' in request.query_params else None
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        page = next_page(profile, token=request.query_params.get('token'), limit=limit)
+    except InvalidToken as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = RecommendedProjectSerializer(
+        page.projects, many=True, context={'request': request, 'scores': page.scores},
+    ).data
+    next_url = None
+    if page.token is not None:
+        next_url = replace_query_param(request.build_absolute_uri(), 'token', page.token)
+    return Response({"next": next_url, "token": page.token, "results": results})
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@throttle_classes([TokenBucketThrottle.scoped('join')])
+def swipe_api(request):
+    try:
+        profile = request.user.userprofile
+    except Exception:
+        return Response({"error": "User profile not found"}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = SwipeSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    project = get_object_or_404(Project.objects.only('pk', 'created_by'), pk=serializer.validated_data['project'])
+    direction = serializer.validated_data['direction']
+    try:
+        joined = record_swipe(profile, project, direction)
+    except OwnProject as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(
+        {"project": project.pk, "direction": direction, "joined": joined},
+        status=status.HTTP_201_CREATED,
+    )
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@throttle_classes([TokenBucketThrottle.scoped('join')])
+def bulk_membership_api(request):
+    try:
+        profile = request.user.userprofile
+    except Exception:
+        return Response({"error": "User profile not found"}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = MembershipBulkSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    requested = set(serializer.validated_data['join']) | set(serializer.validated_data['leave'])
+    projects = Project.objects.only('pk', 'created_by').in_bulk(requested)
+    join_ids = [pk for pk in serializer.validated_data['join'] if pk in projects]
+    leave_ids = [pk for pk in serializer.validated_data['leave'] if pk in projects]
+    own_ids = []
+
+    with transaction.atomic():
+        # one project at a time, under the same lock and rules as a single join
+        for pk in join_ids:
+            try:
+                projects[pk].add_member(profile)
+            except OwnProject:
+                own_ids.append(pk)
+        if leave_ids:
+            profile.projects_joined.remove(*leave_ids)
+
+    return Response({
+        "joined": [pk for pk in join_ids if pk not in own_ids],
+        "left": leave_ids,
+        "own": own_ids,
+        "not_found": sorted(requested - set(projects)),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def project_team_api(request, pk):
+    project = get_object_or_404(Project.objects.prefetch_related('members'), pk=pk)
+    try:
+        hours = max(int(request.query_params.get('hours', DEFAULT_HOURS_PER_ROLE)), 1)
+        pool_size = min(max(int(request.query_params.get('pool', DEFAULT_POOL_SIZE)), 1), 500)
+    except ValueError:
+        return Response({"error": "hours and pool must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+    include_members = request.query_params.get('include_members') in ('1', 'true')
+
+    team = build_team(project, hours_per_role=hours, pool_size=pool_size, exclude_members=not include_members)
+    profiles = UserProfile.objects.select_related('user').in_bulk(team.profile_ids)
+    return Response(serialize_team(team, profiles))
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def batch_projects_api(request):
+    """
+    Create and partially update many projects in one request.
+
+    Body: ``{"create": [project, ...], "update": [{"id": ..., field: value}, ...]}``.
+    Either every item is written, in one transaction, or nothing is and the
+    per-item results say which items were invalid.
+    """
+    try:
+        profile = request.user.userprofile
+    except Exception:
+        return Response({"error": "User profile not found"}, status=status.HTTP_400_BAD_REQUEST)
+
+    data = request.data if isinstance(request.data, dict) else {}
+    create_items = data.get('create') or []
+    update_items = data.get('update') or []
+    if not create_items and not update_items:
+        return Response({"error": "Provide projects to create or update."}, status=status.HTTP_400_BAD_REQUEST)
+
+    ids = [item['id'] for item in update_items if isinstance(item, dict) and isinstance(item.get('id'), int)]
+    context = {
+        'request': request,
+        'can_edit': lambda project: request.user.is_staff or project.created_by_id == profile.pk,
+    }
+    creating = ProjectBulkListSerializer(child=ProjectSerializer(), data=create_items, context=context)
+    updating = ProjectBulkListSerializer(
+        Project.objects.in_bulk(ids), child=ProjectSerializer(partial=True),
+        data=update_items, partial=True, context=context,
+    )
+    valid = [serializer.is_valid() for serializer in (creating, updating)]
+
+    if not all(valid):
+        results = []
+        for op, serializer, items in (('create', creating, create_items), ('update', updating, update_items)):
+            errors = serializer.errors
+            if not isinstance(items, list) or any(not isinstance(key, int) for key in errors):
+                # the list itself was rejected (not a list, too long)
+                results.append({"op": op, "status": "invalid", "errors": errors})
+                continue
+            for index in range(len(items)):
+                if index in errors:
+                    results.append({"op": op, "index": index, "status": "invalid", "errors": errors[index]})
+                else:
+                    results.append({"op": op, "index": index, "status": "skipped"})
+        return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        created = creating.save(created_by=profile) if create_items else []
+        updated = updating.save() if update_items else []
+        # bulk writes skip post_save, so run its side effects once for the batch
+        projects_saved_in_bulk(created + updated)
+
+    results = [{"op": "create", "index": i, "status": "created", "id": p.pk} for i, p in enumerate(created)]
+    results += [{"op": "update", "index": i, "status": "updated", "id": p.pk} for i, p in enumerate(updated)]
+    return Response({"results": results}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def project_cache_stats_api(request):
+    return Response(project_cache.stats.as_dict())
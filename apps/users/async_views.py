@@ -0,0 +1,42 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from core.throttling import throttle
+
+from .registration import UsernameTaken, ahash_password, create_account, profile_fields
+from .serializers import RegisterSerializer
+
+
+@csrf_exempt
+@require_POST
+@throttle('register')
+async def register_api(request):
+    """
+    Create an account from a JSON body (see ``RegisterSerializer``).
+
+    The password is hashed on the registration pool while the event loop
+    keeps serving other requests; user and profile are then written in one
+    transaction.
+    """
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': 'Request body must be JSON.'}, status=400)
+    serializer = RegisterSerializer(data=payload)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+    data = serializer.validated_data
+
+    password_hash = await ahash_password(data['password'])
+    try:
+        user = await sync_to_async(
+            lambda: create_account(
+                data['username'], password_hash, email=data.get('email', ''), **profile_fields(data),
+            )
+        )()
+    except UsernameTaken:
+        return JsonResponse({'username': ['A user with that username already exists.']}, status=400)
+    return JsonResponse({'id': user.pk, 'username': user.username}, status=201)
@@ -0,0 +1,101 @@
+"""
+Loading the authenticated user.
+
+The session backend and the JWT authentication class here fetch the user
+together with their profile in one joined query, so the many
+``request.user.userprofile`` lookups in the views cost nothing afterwards.
+With ``USER_CACHE_TIMEOUT`` set, loaded users are also kept in the cache for
+that many seconds; saving or deleting the user or the profile evicts them.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+User = get_user_model()
+
+
+def get_cache():
+    return caches[getattr(settings, 'USER_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'USER_CACHE_TIMEOUT', 0)
+
+
+def user_cache_key(user_id):
+    return f'users:auth:{user_id}'
+
+
+def load_user(user_id):
+    """The user with ``user_id`` and their profile (one query, or none on a cache hit), or None."""
+    timeout = get_timeout()
+    if timeout:
+        user = get_cache().get(user_cache_key(user_id))
+        if user is not None:
+            return user
+    user = User._default_manager.select_related('userprofile').filter(pk=user_id).first()
+    if user is not None and timeout:
+        get_cache().set(user_cache_key(user_id), user, timeout)
+    return user
+
+
+async def aload_user(user_id):
+    timeout = get_timeout()
+    if timeout:
+        user = await get_cache().aget(user_cache_key(user_id))
+        if user is not None:
+            return user
+    user = await User._default_manager.select_related('userprofile').filter(pk=user_id).afirst()
+    if user is not None and timeout:
+        await get_cache().aset(user_cache_key(user_id), user, timeout)
+    return user
+
+
+def invalidate_user(user_id):
+    if get_timeout():
+        get_cache().delete(user_cache_key(user_id))
+
+
+def cached_profile(user):
+    """``(loaded, profile)``: whether the profile came with ``user``, and the profile or None."""
+    if not User.userprofile.is_cached(user):
+        return False, None
+    return True, getattr(user, 'userprofile', None)
+
+
+class ProfileModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = load_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        user = await aload_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` whose user lookup goes through ``load_user``."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = load_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,157 @@
+"""
+Tag canonicalization.
+
+Every skill, interest, tech and role string goes through ``canonicalize``
+before it is stored, so "React", "react " and "ReactJS" all become "React".
+Spellings are compared by their alias key (lower case, without spaces, dots,
+dashes or underscores) and resolved through an in-memory table built from
+``DEFAULT_ALIASES``, ``TagAlias`` rows and existing Skill/Role names. The
+table is rebuilt when a TagAlias changes in this process and otherwise every
+``TAG_ALIAS_RELOAD_SECONDS`` so other workers pick up changes.
+"""
+import re
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+TAG_MAX_LENGTH = 100
+KEY_MEMO_SIZE = 50000
+
+_STRIP_RE = re.compile(r'[\s._-]+')
+
+DEFAULT_ALIASES = {
+    'react': 'React',
+    'reactjs': 'React',
+    'reactnative': 'React Native',
+    'vue': 'Vue.js',
+    'vuejs': 'Vue.js',
+    'angularjs': 'Angular',
+    'node': 'Node.js',
+    'nodejs': 'Node.js',
+    'js': 'JavaScript',
+    'javascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'typescript': 'TypeScript',
+    'py': 'Python',
+    'python': 'Python',
+    'python3': 'Python',
+    'django': 'Django',
+    'djangorestframework': 'Django REST Framework',
+    'drf': 'Django REST Framework',
+    'postgres': 'PostgreSQL',
+    'postgresql': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'mongodb': 'MongoDB',
+    'golang': 'Go',
+    'k8s': 'Kubernetes',
+    'kubernetes': 'Kubernetes',
+    'aws': 'AWS',
+    'gcp': 'Google Cloud',
+    'tensorflow': 'TensorFlow',
+    'ml': 'Machine Learning',
+    'css3': 'CSS',
+    'html5': 'HTML',
+    'backenddev': 'Backend Developer',
+    'backenddeveloper': 'Backend Developer',
+    'frontenddev': 'Frontend Developer',
+    'frontenddeveloper': 'Frontend Developer',
+    'fullstackdeveloper': 'Full-stack Developer',
+    'devopsengineer': 'DevOps Engineer',
+    'sre': 'Site Reliability Engineer',
+}
+
+
+def clean_tag(value):
+    """Collapse whitespace and cap the length; the user's spelling is kept."""
+    return ' '.join(str(value).split())[:TAG_MAX_LENGTH]
+
+
+def alias_key(value):
+    return _STRIP_RE.sub('', str(value).lower())[:TAG_MAX_LENGTH]
+
+
+class Canonicalizer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._table = None
+        self._keys = {}
+        self._loaded_at = 0.0
+        self._reload_after = 0.0
+
+    def reload_seconds(self):
+        return getattr(settings, 'TAG_ALIAS_RELOAD_SECONDS', 60)
+
+    def invalidate(self):
+        self._table = None
+
+    def _load(self):
+        from .models import Role, Skill, TagAlias
+
+        table = {}
+        # existing canonical names first, so aliases override them
+        for model in (Skill, Role):
+            for name in model.objects.values_list('name', flat=True):
+                table.setdefault(alias_key(name), sys.intern(name))
+        table.update({key: sys.intern(name) for key, name in DEFAULT_ALIASES.items()})
+        table.update({
+            alias: sys.intern(canonical)
+            for alias, canonical in TagAlias.objects.values_list('alias', 'canonical')
+        })
+        return table
+
+    def table(self):
+        table = self._table
+        if table is None or time.monotonic() > self._reload_after:
+            with self._lock:
+                if self._table is None or time.monotonic() > self._reload_after:
+                    self._keys = {}
+                    self._table = self._load()
+                    self._loaded_at = time.monotonic()
+                    self._reload_after = self._loaded_at + self.reload_seconds()
+                table = self._table
+        return table
+
+    def canonicalize(self, value):
+        cleaned = clean_tag(value)
+        if not cleaned:
+            return ''
+        return self.table().get(alias_key(cleaned)) or cleaned
+
+    def key(self, value):
+        # memoised per table: scoring normalizes the same few hundred tags over and over
+        self.table()
+        keys = self._keys
+        result = keys.get(value)
+        if result is None:
+            result = alias_key(self.canonicalize(value))
+            if len(keys) < KEY_MEMO_SIZE:
+                keys[value] = result
+        return result
+
+
+canonicalizer = Canonicalizer()
+
+
+def canonicalize(value):
+    return canonicalizer.canonicalize(value)
+
+
+def canonicalize_list(values):
+    """Canonical forms of ``values`` with blanks and duplicates dropped, order kept."""
+    result = []
+    seen = set()
+    for value in values or []:
+        canonical = canonicalize(value)
+        key = alias_key(canonical)
+        if canonical and key not in seen:
+            seen.add(key)
+            result.append(canonical)
+    return result
+
+
+def normalized_key(value):
+    """Precomputed comparison form of a tag: the alias key of its canonical form."""
+    return canonicalizer.key(value)
@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from .registration import create_account, hash_password
 
 User = get_user_model()
 
@@ -14,13 +14,16 @@ class CustomUserCreationForm(UserCreationForm):
         fields = ("username", "email", "password1", "password2")
     
     def save(self, commit=True):
-        user = super().save(commit=False)
-        user.email = self.cleaned_data["email"]
-        if commit:
-            user.save()
-            # Create user profile
-            UserProfile.objects.create(user=user)
-        return user
+        if not commit:
+            user = super().save(commit=False)
+            user.email = self.cleaned_data["email"]
+            return user
+        # Create user and profile; raises UsernameTaken if the name is in use
+        return create_account(
+            self.cleaned_data["username"],
+            hash_password(self.cleaned_data["password1"]),
+            email=self.cleaned_data["email"],
+        )
 
 
 class LoginForm(forms.Form):
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from users.tags import rebuild_profile_tags
+
+
+class Command(BaseCommand):
+    help = 'Backfill the indexed skill/interest/role tables from the JSON fields on every profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_profile_tags(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Synced tags for {total} profiles'))
@@ -0,0 +1,38 @@
+import gzip
+import json
+
+from django.core.management.base import BaseCommand
+from users.registration import register_many
+
+
+class Command(BaseCommand):
+    help = 'Register accounts from an NDJSON file of {"username", "password", "email", profile fields...}'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON file; a .gz path is read as gzip')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        self.skipped = 0
+        result = register_many(self.read(options['path']), batch_size=options['batch_size'])
+        if result.taken:
+            self.stderr.write(self.style.WARNING(f'{len(result.taken)} usernames already taken'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Registered {len(result.created)} users, skipped {self.skipped} lines'
+        ))
+
+    def read(self, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as stream:
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict) or not record.get('username') or not record.get('password'):
+                        raise ValueError('username and password are required')
+                except ValueError as exc:
+                    self.skipped += 1
+                    self.stderr.write(self.style.WARNING(f'line {line_number}: {exc}'))
+                    continue
+                yield record
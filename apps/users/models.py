@@ -1,12 +1,58 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.contrib.postgres.fields import ArrayField
-import json
 
 
 User = get_user_model()
 
 
+class TagAlias(models.Model):
+    """
+    Maps a spelling of a skill/role (stored as its alias key, see
+    ``users.canonical.alias_key``) to the canonical display form.
+    """
+    alias = models.CharField(max_length=100, unique=True)
+    canonical = models.CharField(max_length=100)
+
+    class Meta:
+        verbose_name_plural = 'tag aliases'
+
+    def __str__(self):
+        return f'{self.alias} -> {self.canonical}'
+
+
+class Skill(models.Model):
+    """Canonical skill/technology tag shared by profiles and projects."""
+    name = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Role(models.Model):
+    name = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class UserProfileQuerySet(models.QuerySet):
+    def with_skill(self, name, include_interests=False):
+        from .tags import normalize_tag
+        kinds = [ProfileSkill.SKILL, ProfileSkill.INTEREST] if include_interests else [ProfileSkill.SKILL]
+        return self.filter(
+            pk__in=ProfileSkill.objects.filter(skill__normalized=normalize_tag(name), kind__in=kinds)
+            .values('profile_id')
+        )
+
+    def with_role(self, name):
+        from .tags import normalize_tag
+        return self.filter(
+            pk__in=ProfileRole.objects.filter(role__normalized=normalize_tag(name)).values('profile_id')
+        )
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
@@ -16,5 +62,34 @@ class UserProfile(models.Model):
     availability_hours = models.IntegerField(default=10)
     preferred_roles = models.JSONField(default=list)
 
+    objects = UserProfileQuerySet.as_manager()
+
     def __str__(self):
-        return getattr(self.user, 'username', str(self.pk))
\ No newline at end of file
+        return getattr(self.user, 'username', str(self.pk))
+
+
+class ProfileSkill(models.Model):
+    """Indexed mirror of ``UserProfile.skills`` and ``interests``, kept in sync on save."""
+    SKILL = 'skill'
+    INTEREST = 'interest'
+    KIND_CHOICES = [(SKILL, 'Skill'), (INTEREST, 'Interest')]
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='profile_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_skills')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=SKILL)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'kind', 'profile'], name='unique_profile_skill'),
+        ]
+
+
+class ProfileRole(models.Model):
+    """Indexed mirror of ``UserProfile.preferred_roles``."""
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='profile_roles')
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='profile_roles')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['role', 'profile'], name='unique_profile_role'),
+        ]
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Account creation.
+
+A user and their profile are created in one transaction. The ``username``
+unique constraint catches exact clashes; names differing only in case are
+checked inside the same transaction, as Django's own forms do. Either
+surfaces as ``UsernameTaken``. Password hashing runs on a small shared
+thread pool (``PASSWORD_HASH_WORKERS``): the hashers spend their time in
+``hashlib`` with the GIL released, so the pool bounds how many CPU-heavy
+hashes run at once during a signup spike, and async callers can await a hash
+without holding a request thread.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .canonical import canonicalize_list
+from .models import UserProfile
+from .tags import rebuild_profile_tags
+
+User = get_user_model()
+
+PROFILE_FIELDS = ('bio', 'skills', 'interests', 'availability_hours', 'preferred_roles')
+TAG_FIELDS = ('skills', 'interests', 'preferred_roles')
+
+_executor = None
+
+
+class UsernameTaken(Exception):
+    pass
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, 'PASSWORD_HASH_WORKERS', None) or min(4, os.cpu_count() or 1)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor
+
+
+def submit_hash(password):
+    """Start hashing ``password`` on the pool; returns a ``Future`` of the encoded hash."""
+    return get_executor().submit(make_password, password)
+
+
+def hash_password(password):
+    return submit_hash(password).result()
+
+
+async def ahash_password(password):
+    return await asyncio.wrap_future(submit_hash(password))
+
+
+def profile_fields(data):
+    fields = {name: data[name] for name in PROFILE_FIELDS if data.get(name) is not None}
+    for name in TAG_FIELDS:
+        if name in fields:
+            fields[name] = canonicalize_list(fields[name])
+    return fields
+
+
+def create_account(username, password_hash, email='', **profile):
+    """
+    Create a user with an already hashed password and their profile atomically.
+
+    Raises ``UsernameTaken`` if the username exists in any letter case;
+    nothing is written then.
+    """
+    username = User.normalize_username(username)
+    email = User.objects.normalize_email(email)
+    try:
+        with transaction.atomic():
+            user = User.objects.create(username=username, email=email, password=password_hash)
+            if User.objects.filter(username__iexact=username).exclude(pk=user.pk).exists():
+                raise UsernameTaken(username)
+            UserProfile.objects.create(user=user, **profile)
+    except IntegrityError:
+        if User.objects.filter(username=username).exists():
+            raise UsernameTaken(username)
+        raise
+    return user
+
+
+def register(username, password, email='', **profile):
+    return create_account(username, hash_password(password), email=email, **profile)
+
+
+@dataclass
+class BulkRegistration:
+    created: list = field(default_factory=list)
+    taken: list = field(default_factory=list)
+
+
+def register_many(records, batch_size=500):
+    """
+    Register many accounts from dicts with ``username``, ``password`` and
+    optional ``email`` and profile fields.
+
+    Each batch is hashed in parallel on the pool and written with two
+    ``bulk_create`` calls in one transaction. Usernames that already exist in
+    any letter case, or repeat within the input, are left untouched and
+    reported in ``taken``. A clash with an account registered concurrently
+    fails the batch with ``IntegrityError`` rather than adopting that account.
+    """
+    result = BulkRegistration()
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        hashes = list(get_executor().map(make_password, [record['password'] for record in batch]))
+        accounts = [
+            (User.normalize_username(record['username']), record, password_hash)
+            for record, password_hash in zip(batch, hashes)
+        ]
+        with transaction.atomic():
+            seen = set(
+                User.objects.annotate(lowered=Lower('username'))
+                .filter(lowered__in={username.lower() for username, _, _ in accounts})
+                .values_list('lowered', flat=True)
+            )
+            new = []
+            for username, record, password_hash in accounts:
+                if username.lower() in seen:
+                    result.taken.append(username)
+                    continue
+                seen.add(username.lower())
+                new.append((username, record, password_hash))
+            User.objects.bulk_create([
+                User(
+                    username=username, email=User.objects.normalize_email(record.get('email', '')),
+                    password=password_hash,
+                )
+                for username, record, password_hash in new
+            ])
+            user_ids = dict(
+                User.objects.filter(username__in=[username for username, _, _ in new]).values_list('username', 'pk')
+            )
+            profiles = [UserProfile(user_id=user_ids[username], **profile_fields(record)) for username, record, _ in new]
+            UserProfile.objects.bulk_create(profiles)
+            rebuild_profile_tags(UserProfile.objects.filter(user_id__in=user_ids.values()), batch_size=batch_size)
+        result.created += [username for username, _, _ in new]
+    return result
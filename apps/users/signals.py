@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from .auth import invalidate_user
+from .canonical import canonicalizer
+from .models import TagAlias, UserProfile
+from .tags import sync_profile_tags
+
+# sent after a profile is created or its skills, interests or roles change;
+# receivers get ``instance`` and ``created``
+profile_tags_changed = Signal()
+
+# sent after a user's username changes; receivers get ``instance``
+username_changed = Signal()
+
+
+def _tag_snapshot(profile):
+    return (list(profile.skills or []), list(profile.interests or []), list(profile.preferred_roles or []))
+
+
+@receiver(post_init, sender=UserProfile)
+def profile_loaded(sender, instance, **kwargs):
+    instance._tag_snapshot = _tag_snapshot(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    snapshot = _tag_snapshot(instance)
+    changed = created or snapshot != getattr(instance, '_tag_snapshot', None)
+    instance._tag_snapshot = snapshot
+    if changed:
+        sync_profile_tags(instance)
+        profile_tags_changed.send(sender=UserProfile, instance=instance, created=created)
+
+
+@receiver(post_init, sender=get_user_model())
+def user_loaded(sender, instance, **kwargs):
+    instance._loaded_username = instance.username
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created=False, raw=False, **kwargs):
+    changed = not created and instance.username != getattr(instance, '_loaded_username', instance.username)
+    instance._loaded_username = instance.username
+    if changed and not raw:
+        username_changed.send(sender=sender, instance=instance)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=TagAlias)
+@receiver(post_delete, sender=TagAlias)
+def tag_alias_changed(sender, **kwargs):
+    canonicalizer.invalidate()
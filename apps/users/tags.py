@@ -0,0 +1,114 @@
+"""
+Canonical Skill/Role rows and the indexed through tables that mirror the
+JSON tag lists on profiles and projects.
+
+The JSON fields stay the source of truth (and what the serializers read);
+the through tables exist so "profiles with skill X" or "projects needing
+role Y" are indexed joins instead of Python scans over every row.
+"""
+from django.db import transaction
+
+from .canonical import canonicalize, normalized_key
+from .models import ProfileRole, ProfileSkill, Role, Skill, UserProfile
+
+
+def normalize_tag(value):
+    return normalized_key(value)
+
+
+def _get_or_create(model, names):
+    """``{normalized: instance}`` for ``names``, creating missing rows in bulk."""
+    wanted = {}
+    for name in names:
+        normalized = normalize_tag(name)
+        if normalized:
+            wanted.setdefault(normalized, canonicalize(name))
+    if not wanted:
+        return {}
+    found = {obj.normalized: obj for obj in model.objects.filter(normalized__in=wanted)}
+    missing = [model(name=wanted[key], normalized=key) for key in wanted if key not in found]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        found = {obj.normalized: obj for obj in model.objects.filter(normalized__in=wanted)}
+    return found
+
+
+def get_or_create_skills(names):
+    return _get_or_create(Skill, names)
+
+
+def get_or_create_roles(names):
+    return _get_or_create(Role, names)
+
+
+def profile_tag_rows(profile, skills, roles):
+    """Through rows for ``profile`` given ``{normalized: Skill/Role}`` lookups."""
+    skill_rows = {
+        (skills[normalize_tag(name)].pk, ProfileSkill.SKILL)
+        for name in profile.skills or [] if normalize_tag(name)
+    }
+    skill_rows |= {
+        (skills[normalize_tag(name)].pk, ProfileSkill.INTEREST)
+        for name in profile.interests or [] if normalize_tag(name)
+    }
+    role_rows = {roles[normalize_tag(name)].pk for name in profile.preferred_roles or [] if normalize_tag(name)}
+    return skill_rows, role_rows
+
+
+@transaction.atomic
+def sync_profile_tags(profile):
+    """Bring ``profile``'s ProfileSkill/ProfileRole rows in line with its JSON lists."""
+    skills = get_or_create_skills([*(profile.skills or []), *(profile.interests or [])])
+    roles = get_or_create_roles(profile.preferred_roles or [])
+    wanted_skills, wanted_roles = profile_tag_rows(profile, skills, roles)
+
+    existing_skills = set(ProfileSkill.objects.filter(profile=profile).values_list('skill_id', 'kind'))
+    for skill_id, kind in existing_skills - wanted_skills:
+        ProfileSkill.objects.filter(profile=profile, skill_id=skill_id, kind=kind).delete()
+    ProfileSkill.objects.bulk_create([
+        ProfileSkill(profile=profile, skill_id=skill_id, kind=kind)
+        for skill_id, kind in wanted_skills - existing_skills
+    ], ignore_conflicts=True)
+
+    existing_roles = set(ProfileRole.objects.filter(profile=profile).values_list('role_id', flat=True))
+    if existing_roles - wanted_roles:
+        ProfileRole.objects.filter(profile=profile, role_id__in=existing_roles - wanted_roles).delete()
+    ProfileRole.objects.bulk_create([
+        ProfileRole(profile=profile, role_id=role_id) for role_id in wanted_roles - existing_roles
+    ], ignore_conflicts=True)
+
+
+def rebuild_profile_tags(queryset=None, batch_size=1000):
+    """Rebuild through rows for ``queryset`` (all profiles by default) in batches."""
+    if queryset is None:
+        queryset = UserProfile.objects.all()
+    queryset = queryset.only('pk', 'skills', 'interests', 'preferred_roles').order_by('pk')
+    total = 0
+    batch = []
+    for profile in queryset.iterator(chunk_size=batch_size):
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            total += _rebuild_profile_batch(batch)
+            batch = []
+    if batch:
+        total += _rebuild_profile_batch(batch)
+    return total
+
+
+@transaction.atomic
+def _rebuild_profile_batch(profiles):
+    skills = get_or_create_skills([
+        name for profile in profiles for name in [*(profile.skills or []), *(profile.interests or [])]
+    ])
+    roles = get_or_create_roles([name for profile in profiles for name in profile.preferred_roles or []])
+    skill_rows = []
+    role_rows = []
+    for profile in profiles:
+        wanted_skills, wanted_roles = profile_tag_rows(profile, skills, roles)
+        skill_rows += [ProfileSkill(profile=profile, skill_id=sid, kind=kind) for sid, kind in wanted_skills]
+        role_rows += [ProfileRole(profile=profile, role_id=rid) for rid in wanted_roles]
+    ProfileSkill.objects.filter(profile__in=profiles).delete()
+    ProfileRole.objects.filter(profile__in=profiles).delete()
+    ProfileSkill.objects.bulk_create(skill_rows)
+    ProfileRole.objects.bulk_create(role_rows)
+    return len(profiles)
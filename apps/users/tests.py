@@ -1,3 +1,182 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from .auth import ProfileJWTAuthentication, load_user
+from .canonical import canonicalize, canonicalize_list, canonicalizer
+from .models import ProfileRole, ProfileSkill, Skill, TagAlias, UserProfile
+from .registration import register_many
+from .serializers import RegisterSerializer
+from .tags import rebuild_profile_tags
+
+User = get_user_model()
+
+
+def make_profile(username, **fields):
+    user = User.objects.create_user(username=username, password='pass12345')
+    return UserProfile.objects.create(user=user, **fields)
+
+
+class ProfileTagTests(TestCase):
+    def test_save_syncs_tag_tables(self):
+        profile = make_profile('alice', skills=['Python', 'python '], interests=['Go'], preferred_roles=['Backend'])
+        self.assertEqual(Skill.objects.filter(normalized='python').count(), 1)
+        self.assertEqual(
+            set(profile.profile_skills.values_list('skill__normalized', 'kind')),
+            {('python', 'skill'), ('go', 'interest')},
+        )
+        profile.skills = ['Rust']
+        profile.preferred_roles = []
+        profile.save()
+        self.assertEqual(
+            set(profile.profile_skills.values_list('skill__normalized', 'kind')),
+            {('rust', 'skill'), ('go', 'interest')},
+        )
+        self.assertFalse(ProfileRole.objects.filter(profile=profile).exists())
+
+    def test_indexed_filters(self):
+        alice = make_profile('alice', skills=['Python'], interests=['Go'], preferred_roles=['Backend'])
+        bob = make_profile('bob', skills=['Go'])
+        self.assertEqual(list(UserProfile.objects.with_skill('go')), [bob])
+        self.assertEqual(list(UserProfile.objects.with_skill('go', include_interests=True).order_by('pk')), [alice, bob])
+        self.assertEqual(list(UserProfile.objects.with_role('BACKEND')), [alice])
+
+    def test_backfill(self):
+        alice = make_profile('alice', skills=['Python'])
+        ProfileSkill.objects.all().delete()
+        UserProfile.objects.filter(pk=alice.pk).update(skills=['Python', 'SQL'], preferred_roles=['DBA'])
+        self.assertEqual(rebuild_profile_tags(batch_size=1), 1)
+        self.assertEqual(list(UserProfile.objects.with_skill('sql')), [alice])
+        self.assertEqual(list(UserProfile.objects.with_role('dba')), [alice])
+
+
+class CanonicalizationTests(TestCase):
+    def setUp(self):
+        canonicalizer.invalidate()
+
+    def test_aliases_collapse_spellings(self):
+        self.assertEqual(canonicalize_list(['React', 'react ', 'ReactJS', ' React.js', '']), ['React'])
+        self.assertEqual(canonicalize('  node  js '), 'Node.js')
+        self.assertEqual(canonicalize('Elm'), 'Elm')
+
+    def test_alias_table_overrides(self):
+        TagAlias.objects.create(alias='elmlang', canonical='Elm')
+        self.assertEqual(canonicalize('elm-lang'), 'Elm')
+
+    def test_register_serializer_canonicalizes(self):
+        serializer = RegisterSerializer(data={
+            'username': 'carol', 'password': 'secret123', 'skills': ['reactjs', 'React', 'postgres'],
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        user = serializer.save()
+        self.assertEqual(user.userprofile.skills, ['React', 'PostgreSQL'])
+        self.assertEqual(Skill.objects.get(normalized='react').name, 'React')
+
+
+class RegistrationTests(TestCase):
+    def test_serializer_relies_on_unique_constraint(self):
+        make_profile('taken')
+        serializer = RegisterSerializer(data={'username': 'taken', 'password': 'secret123'})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(User.objects.filter(username='taken').count(), 1)
+
+    def test_form_creates_user_and_profile(self):
+        data = {'username': 'erin', 'email': 'erin@example.com', 'password1': 'Xy7!long-pass', 'password2': 'Xy7!long-pass'}
+        response = self.client.post('/users/register/', data)
+        self.assertEqual(response.status_code, 302)
+        user = User.objects.get(username='erin')
+        self.assertTrue(user.check_password('Xy7!long-pass'))
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+        self.client.logout()
+        response = self.client.post('/users/register/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('already exists', response.content.decode())
+
+    async def test_async_register_api(self):
+        response = await self.async_client.post(
+            '/api/users/api/register/', {'username': 'frank', 'password': 'secret123', 'skills': ['golang']},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        profile = await UserProfile.objects.select_related('user').aget(user__username='frank')
+        self.assertEqual(profile.skills, ['Go'])
+        self.assertTrue(await sync_to_async(profile.user.check_password)('secret123'))
+        response = await self.async_client.post(
+            '/api/users/api/register/', {'username': 'frank', 'password': 'secret123'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_register_many(self):
+        make_profile('taken')
+        result = register_many([
+            {'username': 'u1', 'password': 'pw1', 'skills': ['reactjs']},
+            {'username': 'taken', 'password': 'pw2'},
+            {'username': 'u2', 'password': 'pw3', 'email': 'u2@example.com'},
+            {'username': 'u1', 'password': 'again'},
+        ], batch_size=3)
+        self.assertEqual(result.created, ['u1', 'u2'])
+        self.assertEqual(result.taken, ['taken', 'u1'])
+        self.assertTrue(User.objects.get(username='u1').check_password('pw1'))
+        self.assertEqual(list(UserProfile.objects.with_skill('react')), [UserProfile.objects.get(user__username='u1')])
+
+    def test_register_many_never_adopts_existing_users(self):
+        User.objects.create_user('bare', password='original')
+        result = register_many([
+            {'username': 'bare', 'password': 'pw1'},
+            {'username': 'U1', 'password': 'pw2'},
+            {'username': 'u1', 'password': 'pw3'},
+        ])
+        self.assertEqual(result.created, ['U1'])
+        self.assertEqual(result.taken, ['bare', 'u1'])
+        self.assertFalse(UserProfile.objects.filter(user__username='bare').exists())
+        self.assertTrue(User.objects.get(username='bare').check_password('original'))
+
+    def test_usernames_unique_ignoring_case(self):
+        data = {'username': 'Alice', 'email': 'A@EXAMPLE.COM', 'password1': 'Xy7!long-pass', 'password2': 'Xy7!long-pass'}
+        self.assertEqual(self.client.post('/users/register/', data).status_code, 302)
+        self.assertEqual(User.objects.get(username='Alice').email, 'A@example.com')
+        self.client.logout()
+        response = self.client.post('/users/register/', {**data, 'username': 'alice'})
+        self.assertIn('already exists', response.content.decode())
+        serializer = RegisterSerializer(data={'username': 'ALICE', 'password': 'secret123'})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.assertEqual(User.objects.filter(username__iexact='alice').count(), 1)
+
+
+class ProfileLookupTests(TestCase):
+    def setUp(self):
+        self.profile = make_profile('grace', skills=['Python'])
+
+    def test_session_user_comes_with_profile(self):
+        self.client.login(username='grace', password='pass12345')
+        response = self.client.get('/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        user = response.wsgi_request.user
+        with self.assertNumQueries(0):
+            self.assertEqual(user.userprofile.pk, self.profile.pk)
+
+    def test_jwt_user_comes_with_profile(self):
+        token = str(AccessToken.for_user(self.profile.user))
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with self.assertNumQueries(1):
+            user, _ = ProfileJWTAuthentication().authenticate(request)
+            self.assertEqual(user.userprofile.pk, self.profile.pk)
+
+    @override_settings(USER_CACHE_TIMEOUT=30)
+    def test_cross_request_cache_is_evicted_on_save(self):
+        user_id = self.profile.user_id
+        load_user(user_id)
+        with self.assertNumQueries(0):
+            self.assertEqual(load_user(user_id).userprofile.skills, ['Python'])
+        self.profile.skills = ['Rust']
+        self.profile.save()
+        self.assertEqual(load_user(user_id).userprofile.skills, ['Rust'])
@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import RegisterView, LoginView, logout_view, profile_view
+from .async_views import register_api
 
 app_name = 'users'
 
@@ -8,4 +9,5 @@ urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', logout_view, name='logout'),
     path('profile/', profile_view, name='profile'),
+    path('api/register/', register_api, name='register_api'),
 ]
@@ -2,11 +2,19 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
+from core.throttling import throttle
 from .forms import CustomUserCreationForm, LoginForm
 from .models import UserProfile
+from .registration import UsernameTaken
 
 
+def attempted_username(request):
+    return request.POST.get('username', '').strip().lower() or None
+
+
+@method_decorator(throttle('register'), name='post')
 class RegisterView(TemplateView):
     template_name = 'users/register.html'
     
@@ -22,14 +30,19 @@ class RegisterView(TemplateView):
         
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
-            user = form.save()
+            try:
+                user = form.save()
+            except UsernameTaken:
+                form.add_error('username', 'A user with that username already exists.')
+                return render(request, self.template_name, {'form': form})
             username = form.cleaned_data.get('username')
             messages.success(request, f'Account created for {username}!')
-            login(request, user)
+            login(request, user, backend='users.auth.ProfileModelBackend')
             return redirect('projects:project_list')
         return render(request, self.template_name, {'form': form})
 
 
+@method_decorator(throttle('login', user_key=attempted_username), name='post')
 class LoginView(TemplateView):
     template_name = 'users/login.html'
     